@@ -0,0 +1,288 @@
+"""
+Batch runner: solve many ``.pts`` files concurrently, one file per task.
+
+Files are dispatched to a pool of worker processes.  Each worker loads and
+solves one file and sends back its sizes with the elapsed time; an exception
+in one file is returned as that file's error instead of aborting the batch.
+A worker killed outright (e.g. by the OOM killer) breaks the whole pool: the
+pool is then replaced, and the files caught in flight are rerun one at a time
+until the one that kills its worker is found and reported as failed.
+
+Memory is bounded by a byte budget: every file gets a footprint estimate
+from its size on disk (see :func:`estimate_memory`), and a new task is only
+submitted while the estimates of the tasks in flight fit in the budget — one
+task always runs, however large.
+
+Results can be consumed in completion order (lowest latency) or in input
+order (a completed file is held back until every earlier one is reported).
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from pts_io import is_ptb
+from result_cache import ResultCache
+
+#: Approximate in-memory bytes per byte of ``.pts`` text when the points are
+#: loaded as :class:`~geo.point.Point` objects (object headers, coordinate
+#: lists and boxed floats, plus the grid buckets).
+_LIST_EXPANSION = 10
+
+#: Same, with a columnar :class:`~geo.point_array.PointArray` (a ``float64``
+#: row per ~20-byte text line, plus traversal state).
+_ARRAY_EXPANSION = 2
+
+
+class FileResult(NamedTuple):
+    """Outcome of one batch task.
+
+    Attributes:
+        filename: Dataset path, as given.
+        sizes: Component sizes in descending order (empty on error).
+        points: Number of points in the file.
+        seconds: Wall-clock time spent on the file, loading included.
+        error: Error message, or ``None`` on success.
+        cached: ``True`` if the result came from the result cache.
+    """
+
+    filename: str
+    sizes: List[int]
+    points: int
+    seconds: float
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def estimate_memory(filename: str, as_array: bool = False) -> int:
+    """Estimate the peak memory needed to solve one file.
+
+    Args:
+        filename: Dataset path.
+        as_array: Whether the points are loaded as a columnar store.
+
+    Returns:
+        Estimated bytes (``0`` for a missing file, which fails immediately).
+    """
+    try:
+        size = os.path.getsize(filename)
+        binary = is_ptb(filename)
+    except OSError:
+        return 0
+    if binary:
+        # 16 bytes per 2D row already: only the traversal state (or the
+        # Point objects) comes on top.
+        return size * (2 if as_array else 8)
+    return size * (_ARRAY_EXPANSION if as_array else _LIST_EXPANSION)
+
+
+def solve_file(
+    filename: str,
+    engine: str = "naive",
+    k: Union[int, str] = 8,
+    as_array: bool = False,
+    frontier: bool = False,
+    jit: bool = False,
+) -> FileResult:
+    """Load and solve one file, turning any exception into an error result.
+
+    This is the worker task of :func:`run_batch`.
+
+    Args:
+        filename: Dataset path.
+        engine: Neighbour engine name (see :data:`connectes.ENGINES`).
+        k: Greedy-phase threshold, or ``"auto"``.
+        as_array: Load the points as a columnar store.
+        frontier: Use the level-by-level vectorized traversal.
+        jit: Use the compiled kernels of :mod:`jit_backend`.
+
+    Returns:
+        The file's :class:`FileResult`.
+    """
+    from connectes import load_instance, print_components_sizes  # deferred: cycle
+
+    start = time.perf_counter()
+    try:
+        distance, points = load_instance(filename, as_array=as_array)
+        sizes = print_components_sizes(
+            distance,
+            points,
+            verbose=False,
+            engine=engine,
+            k=k,
+            frontier=frontier,
+            jit=jit,
+        )
+    except Exception as e:
+        return FileResult(filename, [], 0, time.perf_counter() - start, str(e))
+    return FileResult(filename, sizes, len(points), time.perf_counter() - start)
+
+
+def run_batch(
+    filenames: Sequence[str],
+    jobs: Optional[int] = None,
+    engine: str = "naive",
+    k: Union[int, str] = 8,
+    as_array: bool = False,
+    ordered: bool = True,
+    memory_budget: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    frontier: bool = False,
+    jit: bool = False,
+) -> Iterator[FileResult]:
+    """Solve many files in a process pool, streaming the results.
+
+    Args:
+        filenames: Dataset paths, one task each.
+        jobs: Worker processes (default: the CPU count).
+        engine: Neighbour engine name.
+        k: Greedy-phase threshold, or ``"auto"``.
+        as_array: Load the points as a columnar store.
+        ordered: Yield in input order; otherwise in completion order.
+        memory_budget: Cap, in bytes, on the summed
+            :func:`estimate_memory` of the tasks in flight; ``None`` means
+            unlimited.
+        cache: Optional :class:`~result_cache.ResultCache`; hits are answered
+            without a task and new results are stored.
+        frontier: Use the level-by-level vectorized traversal.
+        jit: Use the compiled kernels of :mod:`jit_backend`.
+
+    Yields:
+        One :class:`FileResult` per file.
+    """
+    results: Dict[int, FileResult] = {}
+    pending: Dict[Future, int] = {}
+    keys: Dict[int, str] = {}
+    estimates = [estimate_memory(name, as_array) for name in filenames]
+    next_task = 0
+    next_output = 0
+    looked_up = -1  # last position checked against the cache
+    in_flight = 0
+
+    def finished(position: int, result: FileResult) -> Iterator[FileResult]:
+        """Record a result and yield whatever may now be reported."""
+        nonlocal next_output
+        if not ordered:
+            yield result
+            return
+        results[position] = result
+        while next_output in results:
+            yield results.pop(next_output)
+            next_output += 1
+
+    def submit(position: int) -> Future:
+        """Queue the task of one file on the current pool."""
+        name = filenames[position]
+        return pool.submit(solve_file, name, engine, k, as_array, frontier, jit)
+
+    # Positions whose task was in flight when a worker died.  They are rerun
+    # alone, so that a second break pins down the file that caused it.
+    retry: List[int] = []
+    rerun: Optional[Future] = None
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        while next_task < len(filenames) or retry or pending:
+            if retry and not pending:
+                position = retry.pop(0)
+                try:
+                    future = submit(position)
+                except BrokenProcessPool:
+                    retry.insert(0, position)
+                    pool.shutdown()
+                    pool = ProcessPoolExecutor(max_workers=jobs)
+                    continue
+                rerun = future
+                pending[future] = position
+                in_flight += estimates[position]
+
+            # Submit while the budget allows (always at least one task).
+            while not retry and rerun not in pending and next_task < len(filenames):
+                position, name = next_task, filenames[next_task]
+                if cache is not None and position > looked_up:
+                    looked_up = position
+                    start = time.perf_counter()
+                    try:
+                        keys[position] = cache.key(name, engine=engine, k=k)
+                        hit = cache.get(keys[position])
+                    except OSError:
+                        hit = None
+                    if hit is not None:
+                        next_task += 1
+                        sizes = hit[0]
+                        elapsed = time.perf_counter() - start
+                        yield from finished(
+                            position,
+                            FileResult(name, sizes, sum(sizes), elapsed, cached=True),
+                        )
+                        continue
+
+                cost = estimates[position]
+                if (
+                    pending
+                    and memory_budget is not None
+                    and in_flight + cost > memory_budget
+                ):
+                    break
+                try:
+                    future = submit(position)
+                except BrokenProcessPool:
+                    if pending:
+                        break  # the tasks in flight report the break below
+                    pool.shutdown()
+                    pool = ProcessPoolExecutor(max_workers=jobs)
+                    continue
+                pending[future] = position
+                in_flight += cost
+                next_task += 1
+
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            if any(isinstance(f.exception(), BrokenProcessPool) for f in done):
+                # Every task in flight fails with the pool: collect them all.
+                done, _ = wait(pending)
+            broken = [f for f in done if isinstance(f.exception(), BrokenProcessPool)]
+            for future in done:
+                position = pending.pop(future)
+                in_flight -= estimates[position]
+                if future in broken and len(broken) > 1:
+                    retry.append(position)
+                    continue
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    # The only task lost with the pool killed its worker.
+                    message = "worker process died (e.g. killed by the OS)"
+                    result = FileResult(filenames[position], [], 0, 0.0, message)
+                except Exception as e:
+                    result = FileResult(filenames[position], [], 0, 0.0, str(e))
+                if cache is not None and result.error is None and position in keys:
+                    cache.put(keys[position], result.sizes)
+                yield from finished(position, result)
+            if broken:
+                retry.sort()
+                pool.shutdown()
+                pool = ProcessPoolExecutor(max_workers=jobs)
+    finally:
+        pool.shutdown()
+
+
+def parse_bytes(text: str) -> int:
+    """Parse a byte count with an optional ``K``/``M``/``G`` suffix.
+
+    Args:
+        text: E.g. ``"512M"`` or ``"1048576"``.
+
+    Returns:
+        Number of bytes.
+
+    Raises:
+        ValueError: If *text* is not a valid size.
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the Point distance tests used in the traversal hot loops.
+
+Compares the per-call cost of the original ``p.distance_to(q) <= distance``
+test (ordering dispatch, recursive call, ``sqrt``) against the
+``p.within(q, r_squared)`` fast path, and checks on many random and boundary
+pairs that both tests give exactly the same answers.
+
+Usage::
+
+    python bench_distance.py [num_pairs]
+"""
+
+import random
+import sys
+import timeit
+from typing import List, Tuple
+
+from geo.point import Point, squared_radius
+
+
+def make_pairs(count: int, seed: int = 0) -> List[Tuple[Point, Point, float]]:
+    """Build random point pairs, half of them placed exactly at the threshold.
+
+    Args:
+        count: Number of pairs.
+        seed: RNG seed for reproducibility.
+
+    Returns:
+        ``(p, q, distance)`` triples where *distance* is the threshold to test.
+    """
+    rng = random.Random(seed)
+    pairs = []
+    for index in range(count):
+        p = Point([rng.random(), rng.random()])
+        q = Point([rng.random(), rng.random()])
+        # Every other pair uses its own distance as threshold: boundary case.
+        distance = p.distance_to(q) if index % 2 else rng.random() * 0.5
+        pairs.append((p, q, distance))
+    return pairs
+
+
+def check_identical(pairs: List[Tuple[Point, Point, float]]) -> int:
+    """Count the pairs on which the two tests disagree (expected: ``0``).
+
+    Args:
+        pairs: Triples produced by :func:`make_pairs`.
+
+    Returns:
+        Number of mismatches, in both call directions.
+    """
+    mismatches = 0
+    for p, q, distance in pairs:
+        r_squared = squared_radius(distance)
+        for a, b in ((p, q), (q, p)):
+            if (a.distance_to(b) <= distance) != a.within(b, r_squared):
+                mismatches += 1
+    return mismatches
+
+
+def time_per_call(pairs: List[Tuple[Point, Point, float]], repeat: int = 5) -> None:
+    """Print the best-of-*repeat* cost per call of each test, in nanoseconds.
+
+    Args:
+        pairs: Triples produced by :func:`make_pairs`.
+        repeat: Number of timing rounds.
+    """
+    prepared = [(p, q, d, squared_radius(d)) for p, q, d in pairs]
+
+    def old_test() -> None:
+        for p, q, d, _ in prepared:
+            p.distance_to(q) <= d
+
+    def fast_test() -> None:
+        for p, q, _, r2 in prepared:
+            p.within(q, r2)
+
+    for label, func in (("distance_to <= d", old_test), ("within(q, r²)", fast_test)):
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{label:<18} {best / len(prepared) * 1e9:8.1f} ns/call")
+
+
+def main() -> None:
+    """Entry point: verify identical answers, then time both tests."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    pairs = make_pairs(count)
+
+    mismatches = check_identical(pairs)
+    print(f"{count} pairs checked in both directions: {mismatches} mismatches")
+    time_per_call(pairs)
+
+
+if __name__ == "__main__":
+    main()
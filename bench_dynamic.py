@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark :class:`component_index.ComponentIndex` on a sliding window.
+
+A window of *n* uniform points is loaded once; every round then expires the
+oldest *churn* points and appends as many new ones.  After each round the
+component sizes are obtained two ways and checked to be identical:
+
+* **incremental** — ``remove_points`` + ``add_points`` + ``component_sizes``
+  on the live index (local repairs, or a rebuild past the threshold);
+* **full** — a from-scratch union-find run on the live points, which is what
+  re-running ``connectes.py`` on every batch amounts to.
+
+Usage::
+
+    python bench_dynamic.py [--points 100000] [--churn 1000] [--rounds 10]
+"""
+
+import argparse
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from component_index import ComponentIndex
+from geo.point_array import PointArray
+from union_find import compute_component_sizes_union_find
+
+
+def main() -> None:
+    """Entry point: run the sliding-window rounds and print both timings."""
+    parser = argparse.ArgumentParser(
+        description="Compare incremental and full recomputation on a sliding window."
+    )
+    parser.add_argument("--points", type=int, default=100_000, help="window size")
+    parser.add_argument("--churn", type=int, default=1_000, help="points per round")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--density", type=float, default=2.0, help="expected neighbours per point"
+    )
+    parser.add_argument(
+        "--rebuild-fraction",
+        type=float,
+        default=0.25,
+        help="removals (as a fraction of live points) that trigger a rebuild",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    distance = math.sqrt(args.density / (args.points * math.pi))
+    index = ComponentIndex(distance, rebuild_fraction=args.rebuild_fraction)
+
+    start = time.perf_counter()
+    window = deque(index.add_points(rng.random((args.points, 2))))
+    index.component_sizes()
+    print(
+        f"{args.points} points, d={distance:.6f}: "
+        f"initial build {time.perf_counter() - start:.3f} s"
+    )
+
+    incremental = full = 0.0
+    for round_number in range(1, args.rounds + 1):
+        expired = [window.popleft() for _ in range(min(args.churn, len(window)))]
+        arrivals = rng.random((args.churn, 2))
+
+        start = time.perf_counter()
+        index.remove_points(expired)
+        window.extend(index.add_points(arrivals))
+        sizes = index.component_sizes()
+        elapsed_incremental = time.perf_counter() - start
+
+        rows = np.fromiter(window, dtype=np.intp)
+        live = PointArray(index.points.coordinates[rows])
+        start = time.perf_counter()
+        expected = compute_component_sizes_union_find(
+            distance, live.to_points(), verbose=False
+        )
+        elapsed_full = time.perf_counter() - start
+
+        if sizes != expected:
+            raise AssertionError(f"Round {round_number}: sizes differ.")
+        incremental += elapsed_incremental
+        full += elapsed_full
+        print(
+            f"round {round_number:3d}: incremental {elapsed_incremental * 1000:9.2f} ms"
+            f"   full {elapsed_full * 1000:9.2f} ms"
+        )
+
+    print(
+        f"total: incremental {incremental:.3f} s, full {full:.3f} s "
+        f"(speed-up {full / incremental:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
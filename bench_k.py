@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Sweep the greedy-phase threshold *k* of :func:`connectes.compute_cluster`.
+
+Times the hybrid algorithm for a range of fixed *k* values (``0`` skips the
+greedy phase) and for ``k="auto"`` on the ``exemple_*.pts`` files and on
+generated uniform datasets of several sizes and densities, then prints, per
+dataset, the best fixed *k*, the value picked by
+:func:`connectes.auto_tune_k` and how far the auto run is from the best one.
+Both phases now cost the same per node, so the fixed thresholds time alike
+and the auto run mostly measures the cost of the probe.
+
+Usage::
+
+    python bench_k.py [--engine grid] [--sizes 10000 100000] [--densities 1 4]
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+from typing import List, Union
+
+import numpy as np
+
+from benchmark import dataset_path, sample
+from connectes import ENGINES, auto_tune_k, load_instance, print_components_sizes
+
+DEFAULT_KS = [0, 1, 2, 4, 8, 16, 32, 64, 256]
+
+
+def sweep(
+    filename: str, engine: str, ks: List[int], repeat: int, as_array: bool
+) -> None:
+    """Time every *k* (and ``auto``) on one dataset and print a summary line.
+
+    Args:
+        filename: Dataset path.
+        engine: Neighbour engine name.
+        ks: Fixed thresholds to time.
+        repeat: Measured samples per threshold.
+        as_array: Load the points as a columnar store.
+    """
+    distance, points = load_instance(filename, as_array=as_array)
+    chosen = auto_tune_k(distance, points, ENGINES[engine](distance, points))
+
+    medians = {}
+    candidates: List[Union[int, str]] = [*ks, "auto"]
+    for k in candidates:
+        samples = sample(
+            lambda: print_components_sizes(
+                distance, points, verbose=False, engine=engine, k=k
+            ),
+            repeat,
+            warmup=1,
+        )
+        medians[k] = float(np.median(samples))
+
+    best = min(ks, key=medians.__getitem__)
+    timings = "  ".join(f"k={k}:{medians[k] * 1000:.1f}" for k in candidates)
+    print(f"# {os.path.basename(filename)} ({len(points)} points)")
+    print(f"  {timings} (ms)")
+    print(
+        f"  best k={best}, auto k={chosen}, "
+        f"auto/best = {medians['auto'] / medians[best]:.2f}"
+    )
+
+
+def main() -> None:
+    """Entry point: sweep *k* over the example and generated datasets."""
+    parser = argparse.ArgumentParser(
+        description="Sweep the greedy threshold k of the hybrid algorithm."
+    )
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="grid")
+    parser.add_argument("--ks", nargs="+", type=int, default=DEFAULT_KS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    parser.add_argument(
+        "--densities",
+        nargs="+",
+        type=float,
+        default=[0.5, 2.0, 8.0],
+        help="expected neighbours per point of the generated datasets",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="measured samples")
+    parser.add_argument("--array", action="store_true", help="columnar store")
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.join(tempfile.gettempdir(), "connectes_bench"),
+        help="cache directory for generated datasets",
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "exemple_*.pts")))
+    for density in args.densities:
+        for num_points in args.sizes:
+            files.append(dataset_path(args.data_dir, num_points, density, seed=0))
+
+    for filename in files:
+        sweep(filename, args.engine, sorted(args.ks), args.repeat, args.array)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark harness for the connected-component algorithms.
+
+Generates ladders of datasets with :func:`generates_pts.generate_pts_file`
+(fixed seeds, several densities, uniform or clustered distributions), times
+every registered algorithm with repeated :func:`time.perf_counter` samples
+after warm-up runs, and reports the median and 95th percentile per run (the
+*warm* timings), plus the peak memory allocated during one extra traced run
+(worker processes excluded).  The *cold* timing is the first call in a fresh
+interpreter, which is where one-off costs such as JIT compilation (or loading
+it from the compile cache) show up.  For each algorithm and density, the
+empirical complexity exponent *b* of ``time ≈ a · n^b`` is fitted by least
+squares on the log-log points.
+
+Density is expressed as the expected number of neighbours per point,
+``λ = n·π·d²``; the distance threshold of each file is derived from it so that
+the graph structure stays comparable along a ladder.
+
+Results are written as JSON and/or CSV.  Plotting is optional and headless
+(``matplotlib`` with the ``Agg`` backend, imported only when requested), so the
+harness runs on servers.
+
+Usage::
+
+    python benchmark.py --sizes 1000 10000 100000 --densities 1 4 \\
+        --algorithms hybrid-grid union-find --json bench.json --csv bench.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from cell_graph import compute_component_sizes_cell_graph
+from connectes import load_instance, print_components_sizes
+from dfs_connectes import compute_component_sizes_dfs
+from generates_pts import DISTRIBUTIONS, generate_pts_file
+from union_find import compute_component_sizes_union_find
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_DENSITIES = [0.5, 2.0, 8.0]
+
+
+class Contender(NamedTuple):
+    """One benchmarked algorithm.
+
+    Attributes:
+        run: Callable taking ``(distance, points)`` and returning the sizes.
+        as_array: Load the points as a :class:`~geo.point_array.PointArray`.
+        max_points: Largest dataset the algorithm is run on (quadratic
+            algorithms would never finish on the top of the ladder).
+    """
+
+    run: Callable[..., List[int]]
+    as_array: bool
+    max_points: int
+
+
+#: Algorithms selectable with ``--algorithms``.
+CONTENDERS: Dict[str, Contender] = {
+    "classic-dfs": Contender(
+        partial(compute_component_sizes_dfs, verbose=False), True, 20_000
+    ),
+    "hybrid-naive": Contender(
+        partial(print_components_sizes, verbose=False), True, 20_000
+    ),
+    "hybrid-grid": Contender(
+        partial(print_components_sizes, verbose=False, engine="grid"),
+        False,
+        10_000_000,
+    ),
+    "hybrid-sweep": Contender(
+        partial(print_components_sizes, verbose=False, engine="sweep"),
+        True,
+        1_000_000,
+    ),
+    "hybrid-kdtree": Contender(
+        partial(print_components_sizes, verbose=False, engine="kdtree"),
+        True,
+        10_000_000,
+    ),
+    "union-find": Contender(
+        partial(compute_component_sizes_union_find, verbose=False),
+        False,
+        10_000_000,
+    ),
+    "cell-graph": Contender(
+        partial(compute_component_sizes_cell_graph, verbose=False),
+        True,
+        10_000_000,
+    ),
+    "hybrid-jit": Contender(
+        partial(print_components_sizes, verbose=False, jit=True), True, 10_000_000
+    ),
+    "parallel-4": Contender(
+        partial(print_components_sizes, verbose=False, workers=4), True, 10_000_000
+    ),
+}
+
+
+def threshold_for_density(num_points: int, density: float) -> float:
+    """Return the distance giving *density* expected neighbours per point.
+
+    Args:
+        num_points: Points drawn uniformly in the unit square.
+        density: Expected neighbour count ``λ``.
+
+    Returns:
+        ``sqrt(λ / (n·π))``.
+    """
+    return math.sqrt(density / (num_points * math.pi))
+
+
+def dataset_path(
+    directory: str,
+    num_points: int,
+    density: float,
+    seed: int,
+    distribution: str = "uniform",
+) -> str:
+    """Create (once) and return the ladder file for one size and density.
+
+    Args:
+        directory: Cache directory for generated files.
+        num_points: Number of points.
+        density: Expected neighbours per point (of a uniform set; clustered
+            distributions use the same threshold).
+        seed: Generator seed.
+        distribution: One of :data:`generates_pts.DISTRIBUTIONS`.
+
+    Returns:
+        Path of the ``.pts`` file.
+    """
+    name = f"{distribution}_n{num_points}_l{density:g}_s{seed}.pts"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        generate_pts_file(
+            path,
+            num_points,
+            threshold_for_density(num_points, density),
+            seed=seed,
+            distribution=distribution,
+        )
+    return path
+
+
+def sample(run: Callable[[], Any], repeat: int, warmup: int) -> List[float]:
+    """Time *run* several times after discarding warm-up runs.
+
+    Args:
+        run: Zero-argument callable to time.
+        repeat: Number of measured samples.
+        warmup: Number of untimed runs first.
+
+    Returns:
+        Elapsed seconds of each measured sample.
+    """
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+#: Script timing the first call of a contender in a fresh interpreter.
+_COLD_SCRIPT = """
+import sys, time
+from benchmark import CONTENDERS
+from connectes import load_instance
+contender = CONTENDERS[sys.argv[1]]
+distance, points = load_instance(sys.argv[2], as_array=contender.as_array)
+start = time.perf_counter()
+contender.run(distance, points)
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(name: str, path: str) -> float:
+    """Time the first call of a contender in a new Python process.
+
+    Loading the file is not timed; lazy set-up inside the call is, e.g. the
+    compilation of the :mod:`jit_backend` kernels or their load from the disk
+    cache.
+
+    Args:
+        name: Key of :data:`CONTENDERS`.
+        path: Dataset file.
+
+    Returns:
+        Elapsed seconds of the first call.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run(
+        [sys.executable, "-c", _COLD_SCRIPT, name, path],
+        cwd=here,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.split()[-1])
+
+
+def peak_memory(run: Callable[[], Any]) -> int:
+    """Return the peak bytes allocated while *run* executes once.
+
+    Measured with :mod:`tracemalloc` (which also sees NumPy buffers) in a
+    separate, untimed run, since tracing slows allocation down.
+
+    Args:
+        run: Zero-argument callable to measure.
+
+    Returns:
+        Peak traced allocation in bytes, relative to the start of the run.
+    """
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def fit_exponent(sizes: Sequence[int], times: Sequence[float]) -> Optional[float]:
+    """Fit ``time ≈ a · n^b`` by least squares in log-log space.
+
+    Args:
+        sizes: Dataset sizes.
+        times: Matching median times.
+
+    Returns:
+        The exponent *b*, or ``None`` with fewer than two distinct sizes.
+    """
+    if len(set(sizes)) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(times), 1)
+    return float(slope)
+
+
+def run_ladder(
+    algorithms: Sequence[str],
+    sizes: Sequence[int],
+    densities: Sequence[float],
+    repeat: int,
+    warmup: int,
+    seed: int,
+    directory: str,
+    memory: bool = True,
+    cold: bool = True,
+    distribution: str = "uniform",
+) -> List[Dict[str, Any]]:
+    """Benchmark every algorithm on every ladder dataset it can handle.
+
+    Args:
+        algorithms: Names from :data:`CONTENDERS`.
+        sizes: Point counts of the ladder.
+        densities: Expected neighbours per point.
+        repeat: Measured samples per run.
+        warmup: Untimed runs per run.
+        seed: Dataset generator seed.
+        directory: Cache directory for generated files.
+        memory: Also record the peak memory of each run (see
+            :func:`peak_memory`).
+        cold: Also record the first-call time in a fresh interpreter (see
+            :func:`cold_start`).
+        distribution: Point distribution of the generated datasets.
+
+    Returns:
+        One record per (algorithm, density, size) with its statistics.
+    """
+    records = []
+    for density in densities:
+        for num_points in sizes:
+            path = dataset_path(directory, num_points, density, seed, distribution)
+            for name in algorithms:
+                contender = CONTENDERS[name]
+                if num_points > contender.max_points:
+                    continue
+                distance, points = load_instance(path, as_array=contender.as_array)
+                run = partial(contender.run, distance, points)
+                samples = sample(run, repeat, warmup)
+                record = {
+                    "algorithm": name,
+                    "distribution": distribution,
+                    "density": density,
+                    "points": num_points,
+                    "distance": distance,
+                    "samples": len(samples),
+                    "median_s": float(np.median(samples)),
+                    "p95_s": float(np.percentile(samples, 95)),
+                    "min_s": min(samples),
+                    "peak_mib": peak_memory(run) / 2**20 if memory else None,
+                    "cold_s": cold_start(name, path) if cold else None,
+                }
+                records.append(record)
+                print(
+                    f"{name:<14} λ={density:<5g} n={num_points:<9} "
+                    f"median {record['median_s'] * 1000:10.2f} ms  "
+                    f"p95 {record['p95_s'] * 1000:10.2f} ms"
+                    + (f"  cold {record['cold_s'] * 1000:10.2f} ms" if cold else "")
+                    + (f"  peak {record['peak_mib']:8.2f} MiB" if memory else "")
+                )
+    return records
+
+
+def exponents(records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fit the complexity exponent of each (algorithm, density) series.
+
+    Args:
+        records: Output of :func:`run_ladder`.
+
+    Returns:
+        One entry per series with its fitted exponent (``None`` if too short).
+    """
+    series: Dict[tuple, List[Dict[str, Any]]] = {}
+    for record in records:
+        series.setdefault((record["algorithm"], record["density"]), []).append(record)
+
+    fits = []
+    for (name, density), rows in series.items():
+        exponent = fit_exponent(
+            [row["points"] for row in rows], [row["median_s"] for row in rows]
+        )
+        fits.append({"algorithm": name, "density": density, "exponent": exponent})
+    return fits
+
+
+def write_csv(filename: str, records: Sequence[Dict[str, Any]]) -> None:
+    """Write one CSV row per benchmark record.
+
+    Args:
+        filename: Output path.
+        records: Output of :func:`run_ladder`.
+    """
+    if not records:
+        return
+    with open(filename, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def plot(filename: str, records: Sequence[Dict[str, Any]]) -> None:
+    """Save a log-log plot of median time against size (headless).
+
+    Args:
+        filename: Output image path (format from the extension).
+        records: Output of :func:`run_ladder`.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    series: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        label = f"{record['algorithm']} (λ={record['density']:g})"
+        series.setdefault(label, []).append(record)
+    for label, rows in series.items():
+        plt.loglog(
+            [row["points"] for row in rows],
+            [row["median_s"] for row in rows],
+            marker="o",
+            label=label,
+        )
+    plt.xlabel("Number of points")
+    plt.ylabel("Median time (s)")
+    plt.title("Connected components — scaling")
+    plt.legend(fontsize="small")
+    plt.grid(True, which="both")
+    plt.tight_layout()
+    plt.savefig(filename)
+
+
+def main() -> None:
+    """Entry point: parse options, run the ladder and write the reports."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=sorted(CONTENDERS),
+        default=sorted(CONTENDERS),
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--densities",
+        nargs="+",
+        type=float,
+        default=DEFAULT_DENSITIES,
+        help="expected neighbours per point",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="measured samples")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs")
+    parser.add_argument("--seed", type=int, default=0, help="dataset seed")
+    parser.add_argument(
+        "--distribution",
+        choices=DISTRIBUTIONS,
+        default="uniform",
+        help="point distribution of the generated datasets (default: uniform)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.join(tempfile.gettempdir(), "connectes_bench"),
+        help="cache directory for generated datasets",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip the traced run that measures peak memory",
+    )
+    parser.add_argument(
+        "--no-cold",
+        action="store_true",
+        help="skip the fresh-interpreter run that measures the cold first call",
+    )
+    parser.add_argument("--json", help="write records and exponents as JSON")
+    parser.add_argument("--csv", help="write records as CSV")
+    parser.add_argument("--plot", help="save a log-log plot (headless)")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    records = run_ladder(
+        args.algorithms,
+        sorted(args.sizes),
+        args.densities,
+        args.repeat,
+        args.warmup,
+        args.seed,
+        args.data_dir,
+        memory=not args.no_memory,
+        cold=not args.no_cold,
+        distribution=args.distribution,
+    )
+    fits = exponents(records)
+
+    print("\nEmpirical complexity exponents (time ≈ a·n^b):")
+    for fit in fits:
+        exponent = "n/a" if fit["exponent"] is None else f"{fit['exponent']:.2f}"
+        print(f"  {fit['algorithm']:<14} λ={fit['density']:<5g} b = {exponent}")
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"records": records, "exponents": fits}, handle, indent=2)
+    if args.csv:
+        write_csv(args.csv, records)
+    if args.plot:
+        plot(args.plot, records)
+
+
+if __name__ == "__main__":
+    main()
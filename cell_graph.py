@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Connected-component sizes on the graph of occupied grid cells.
+
+With a cell side of ``distance / sqrt(dimension)``, the diagonal of a cell is
+the distance threshold itself, so all the points of one cell are pairwise
+connected: a cell can be collapsed into a single node weighted by its
+population.  Two cells are joined when *any* of their point pairs is within
+the threshold, and a component's size is the sum of its cells' populations.
+
+The work therefore follows the number of occupied cells rather than the
+number of point pairs:
+
+* neighbouring cell pairs (offsets up to two cells away in 2D, pruned by
+  their minimum gap) are found with vectorized lookups in the sorted cell
+  keys;
+* pairs of single-point cells — the bulk of sparse data — are tested in one
+  vectorized pass;
+* any other pair is skipped when its cells are already in the same set, and
+  otherwise tested block by block with an early exit on the first close pair.
+
+The cell side is shrunk by a relative ``1e-9`` so that rounding can never put
+two points farther apart than the threshold in the same cell; results are
+identical to the other algorithms.
+"""
+
+import argparse
+from itertools import product
+from math import ceil, isinf, sqrt
+from typing import List, Union
+
+import numpy as np
+
+from geo.point import Point, squared_radius
+from geo.point_array import PointArray
+from union_find import UnionFind, void_rows
+
+#: Distances tested per block in the early-exit adjacency test.
+_PROBE_ELEMENTS = 4096
+
+
+def neighbour_offsets(dimension: int, side: float, distance: float) -> List[tuple]:
+    """List the forward cell offsets whose cells may hold a close pair.
+
+    Args:
+        dimension: Space dimension.
+        side: Cell side.
+        distance: Connection threshold.
+
+    Returns:
+        Offsets in the lexicographically positive half of the neighbourhood
+        (each unordered cell pair appears once), excluding ``(0, ...)``.
+    """
+    reach = ceil(distance / side)
+    limit = (distance * (1 + 1e-9)) ** 2
+    origin = (0,) * dimension
+    offsets = []
+    for offset in product(range(-reach, reach + 1), repeat=dimension):
+        if offset <= origin:
+            continue
+        gap = sum(max(abs(o) - 1, 0) ** 2 for o in offset) * side * side
+        if gap <= limit:
+            offsets.append(offset)
+    return offsets
+
+
+def _cells_touch(
+    points: PointArray, rows_a: np.ndarray, rows_b: np.ndarray, r_squared: float
+) -> bool:
+    """Tell whether any point of one cell is within range of the other cell,
+    testing small row chunks so that the first hit ends the search."""
+    chunk = max(1, _PROBE_ELEMENTS // len(rows_b))
+    for start in range(0, len(rows_a), chunk):
+        block = points.block_squared_distances(rows_a[start : start + chunk], rows_b)
+        if (block <= r_squared).any():
+            return True
+    return False
+
+
+def compute_component_sizes_cell_graph(
+    distance: float,
+    points: Union[List[Point], PointArray],
+    verbose: bool = True,
+) -> List[int]:
+    """Compute connected-component sizes on the occupied-cell graph.
+
+    Args:
+        distance: Maximum Euclidean distance that connects two points.
+        points: Complete list of points in the dataset, or their columnar
+            store.
+        verbose: When ``True``, print the sorted sizes to stdout in the form
+            ``[size1, size2, ...]``.
+
+    Returns:
+        Component sizes sorted in descending order.
+    """
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    sizes = _cell_graph_sizes(distance, points)
+
+    if verbose:
+        print("[" + ", ".join(map(str, sizes)) + "]")
+
+    return sizes
+
+
+def _cell_graph_sizes(distance: float, points: PointArray) -> List[int]:
+    """Body of :func:`compute_component_sizes_cell_graph` on a columnar store."""
+    n = len(points)
+    if n == 0:
+        return []
+    if distance < 0:
+        return [1] * n
+    if isinf(distance):
+        return [n]
+    coordinates = points.coordinates
+    if distance == 0:
+        # Only identical points connect: cells of side 0 are the positions.
+        _, counts = np.unique(void_rows(coordinates), return_counts=True)
+        return sorted(counts.tolist(), reverse=True)
+
+    dimension = points.dimension
+    side = distance / sqrt(dimension) * (1 - 1e-9)
+    keys = np.floor(coordinates / side).astype(np.int64)
+    unique_keys, inverse, populations = np.unique(
+        void_rows(keys), return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    cell_keys = unique_keys.view(np.int64).reshape(-1, dimension)
+    cells = len(unique_keys)
+
+    # Members of cell c: members[starts[c]:starts[c + 1]].
+    members = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(populations)))
+
+    # Every (cell, neighbour cell) pair that may hold a close pair.
+    left, right = [], []
+    for offset in neighbour_offsets(dimension, side, distance):
+        shifted = void_rows(cell_keys + np.asarray(offset, dtype=np.int64))
+        position = np.searchsorted(unique_keys, shifted)
+        found = position < cells
+        found[found] = unique_keys[position[found]] == shifted[found]
+        left.append(np.flatnonzero(found))
+        right.append(position[found])
+    cell_a = np.concatenate(left) if left else np.empty(0, dtype=np.intp)
+    cell_b = np.concatenate(right) if right else np.empty(0, dtype=np.intp)
+
+    forest = UnionFind(cells)
+    find, union = forest.find, forest.union
+    r_squared = squared_radius(distance)
+
+    # Single-point cells on both sides: one vectorized distance test.
+    single = (populations[cell_a] == 1) & (populations[cell_b] == 1)
+    point_a = members[starts[cell_a[single]]]
+    point_b = members[starts[cell_b[single]]]
+    diff = coordinates[point_a, 0] - coordinates[point_b, 0]
+    total = diff * diff
+    for axis in range(1, dimension):
+        diff = coordinates[point_a, axis] - coordinates[point_b, axis]
+        total += diff * diff
+    close = total <= r_squared
+    for a, b in zip(cell_a[single][close].tolist(), cell_b[single][close].tolist()):
+        union(a, b)
+
+    # Remaining pairs: skip if already merged, else early-exit block test.
+    for a, b in zip(cell_a[~single].tolist(), cell_b[~single].tolist()):
+        if find(a) == find(b):
+            continue
+        rows_a = members[starts[a] : starts[a + 1]]
+        rows_b = members[starts[b] : starts[b + 1]]
+        if _cells_touch(points, rows_a, rows_b, r_squared):
+            union(a, b)
+
+    roots = np.fromiter((find(c) for c in range(cells)), dtype=np.intp, count=cells)
+    totals = np.bincount(roots, weights=populations)
+    return sorted(totals[totals > 0].astype(np.int64).tolist(), reverse=True)
+
+
+def main() -> None:
+    """Entry point: process one or more ``.pts`` files passed on the command line."""
+    from connectes import load_instance  # deferred: keeps connectes free to import us
+
+    parser = argparse.ArgumentParser(
+        description="Print connected-component sizes on the occupied-cell graph."
+    )
+    parser.add_argument("instances", nargs="*", help=".pts files to process")
+    args = parser.parse_args()
+
+    if not args.instances:
+        parser.print_usage()
+        return
+
+    for filename in args.instances:
+        try:
+            distance, points = load_instance(filename, as_array=True)
+            print(f"# {filename} ({len(points)} points)")
+            compute_component_sizes_cell_graph(distance, points)
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+
+
+if __name__ == "__main__":
+    main()
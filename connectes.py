@@ -13,15 +13,312 @@ traversal:
 
 Seeds are evaluated sequentially to guarantee correctness: a component must be
 fully explored before the next unvisited seed can be safely identified.
+
+Neighbour lookup is delegated to a pluggable *engine* (see :data:`ENGINES`):
+``naive`` scans every point, ``grid`` only inspects the surrounding cells of a
+uniform spatial hash whose cell side equals the distance threshold,
+``sweep`` only inspects points whose X lies within the threshold, and
+``kdtree`` answers radius queries on a :class:`~geo.kdtree.KDTree`.
 """
 
-from sys import argv
-from typing import List, Tuple
+import argparse
+import json
+import random
+from array import array
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from batch_connectes import parse_bytes, run_batch
+from geo.grid import Grid
+from geo.kdtree import KDTree
+from geo.point import Point, squared_radius
+from geo.point_array import PointArray
+from geo.sweep import SweepIndex
+from out_of_core import DEFAULT_MEMORY_BUDGET, compute_component_sizes_out_of_core
+from parallel_connectes import compute_component_sizes_parallel
+from profiling import RunStats, active_stats, profile, timed
+from pts_io import load_coordinates
+from result_cache import ResultCache
+
+#: A point set: either :class:`~geo.point.Point` objects or a columnar store.
+Points = Union[List[Point], PointArray]
+
+#: Maps a point index to the indices that must be tested against it.
+CandidateFinder = Callable[[int], Iterable[int]]
+
+#: Default cap on the number of distances in one block of
+#: :func:`compute_cluster_frontier` (8 MiB of ``float64``).
+DEFAULT_BLOCK_ELEMENTS = 1 << 20
+
+#: Default greedy-phase threshold *k* of :func:`compute_cluster`.  Both phases
+#: do the same work per node, so the value does not change the cost.
+DEFAULT_K = 8
+
+#: Visited flags: a byte per point, or a boolean array for a columnar store.
+Visited = Union[bytearray, List[bool], np.ndarray]
+
+
+def naive_candidates(distance: float, points: Points) -> CandidateFinder:
+    """Build the exhaustive neighbour engine: every point is a candidate.
+
+    Args:
+        distance: Connection threshold (unused, kept for a uniform signature).
+        points: Complete list of points in the dataset.
+
+    Returns:
+        A callable returning every index (a ``range``, or an index array for
+        a :class:`~geo.point_array.PointArray`) for any query.
+    """
+    if isinstance(points, PointArray):
+        everything = np.arange(len(points))
+    else:
+        everything = range(len(points))
+    return lambda _index: everything
+
+
+def grid_candidates(distance: float, points: Points) -> CandidateFinder:
+    """Build the uniform-grid neighbour engine.
+
+    Each point only sees the points of its own cell and of the adjacent cells
+    (8 in 2D) of a :class:`~geo.grid.Grid` whose cell side is *distance*.
+
+    Args:
+        distance: Connection threshold, used as the cell side.
+        points: Complete list of points in the dataset.
+
+    Returns:
+        The :meth:`~geo.grid.Grid.candidates` method of the built grid.
+    """
+    # A hair wider than *distance* so that floating-point rounding in the cell
+    # computation can never split a pair that passes the distance test.
+    return Grid(points, distance * (1 + 1e-9)).candidates
+
+
+def sweep_candidates(distance: float, points: Points) -> CandidateFinder:
+    """Build the sort-and-sweep neighbour engine.
+
+    Points are sorted by X once; each point only sees the contiguous run of
+    points whose X is within *distance* of its own (see
+    :class:`~geo.sweep.SweepIndex`).  Suited to data spread along one axis.
+
+    Args:
+        distance: Connection threshold, used as the window half-width.
+        points: Complete list of points in the dataset.
+
+    Returns:
+        The :meth:`~geo.sweep.SweepIndex.candidates` method of the index.
+    """
+    # Same rounding allowance as the grid engine.
+    return SweepIndex(points, distance * (1 + 1e-9)).candidates
+
+
+def kdtree_candidates(distance: float, points: Points) -> CandidateFinder:
+    """Build the KD-tree neighbour engine.
+
+    Each query is a :meth:`~geo.kdtree.KDTree.query_radius` call, which
+    already returns the exact neighbours; the subsequent distance test in the
+    traversal only re-confirms them.
+
+    Args:
+        distance: Connection threshold, used as the query radius.
+        points: Complete list of points in the dataset.
+
+    Returns:
+        A callable mapping a point index to its neighbours' indices.
+    """
+    tree = KDTree(points)
+    coordinates = tree.coordinates
+    if isinstance(points, PointArray):
+        return lambda index: tree.query_radius(coordinates[index], distance)
+    return lambda index: tree.query_radius(coordinates[index], distance).tolist()
 
-from geo.point import Point
+
+#: Neighbour engines selectable by name in :func:`print_components_sizes`.
+ENGINES: Dict[str, Callable[[float, Points], CandidateFinder]] = {
+    "naive": naive_candidates,
+    "grid": grid_candidates,
+    "sweep": sweep_candidates,
+    "kdtree": kdtree_candidates,
+}
+
+
+def new_visited(points: Points) -> Visited:
+    """Allocate cleared visited flags for a point set, one byte per point.
+
+    Args:
+        points: Complete point set.
+
+    Returns:
+        A NumPy boolean array for a :class:`~geo.point_array.PointArray`
+        (needed by the vectorized filter), a :class:`bytearray` otherwise —
+        an eighth of the size of a list of ``bool`` references.
+    """
+    if isinstance(points, PointArray):
+        return np.zeros(len(points), dtype=bool)
+    return bytearray(len(points))
+
+
+def _index_stack(n: int, start: int) -> "array[int]":
+    """Return a typed traversal stack holding *start*, sized for *n* points."""
+    return array("i" if n < 2**31 else "q", [start])
+
+
+def _unvisited_neighbours(
+    distance: float,
+    points: Points,
+    visited: Visited,
+    candidates: CandidateFinder,
+    stats: Optional[RunStats] = None,
+) -> Callable[[int], List[int]]:
+    """Build the expansion step shared by both phases of :func:`compute_cluster`.
+
+    The returned callable lists the not-yet-visited points within *distance*
+    of a node.  Squared distances are compared against
+    :func:`~geo.point.squared_radius` (no ``sqrt``, same answers as
+    :meth:`~geo.point.Point.distance_to`): through :meth:`Point.within
+    <geo.point.Point.within>` for a list, or as one vectorized pass over the
+    candidates for a :class:`~geo.point_array.PointArray`.
+
+    Args:
+        distance: Maximum Euclidean distance that defines an edge.
+        points: Complete point set.
+        visited: Visited flags; must be a NumPy boolean array when *points*
+            is a :class:`~geo.point_array.PointArray`.
+        candidates: Neighbour engine (see :data:`ENGINES`).
+        stats: When given, the callable also counts its distance evaluations
+            into :attr:`~profiling.RunStats.distance_evaluations`.
+
+    Returns:
+        A callable mapping a node index to the list of its unvisited
+        neighbours.
+    """
+    r_squared = squared_radius(distance)
+
+    if isinstance(points, PointArray):
+
+        def expand_array(current: int) -> List[int]:
+            pool = candidates(current)
+            if not isinstance(pool, np.ndarray):
+                pool = np.fromiter(pool, dtype=np.intp)
+            pool = pool[~visited[pool]]
+            return points.within(current, pool, r_squared).tolist()
+
+        if stats is None:
+            return expand_array
+
+        def expand_array_counted(current: int) -> List[int]:
+            pool = candidates(current)
+            if not isinstance(pool, np.ndarray):
+                pool = np.fromiter(pool, dtype=np.intp)
+            pool = pool[~visited[pool]]
+            stats.distance_evaluations += len(pool)
+            return points.within(current, pool, r_squared).tolist()
+
+        return expand_array_counted
+
+    if stats is not None:
+
+        def expand_list_counted(current: int) -> List[int]:
+            within = points[current].within
+            pool = [n for n in candidates(current) if not visited[n]]
+            stats.distance_evaluations += len(pool)
+            return [n for n in pool if within(points[n], r_squared)]
+
+        return expand_list_counted
+
+    def expand_list(current: int) -> List[int]:
+        within = points[current].within
+        return [
+            neighbour
+            for neighbour in candidates(current)
+            if not visited[neighbour] and within(points[neighbour], r_squared)
+        ]
+
+    return expand_list
+
+
+def auto_tune_k(
+    distance: float,
+    points: Points,
+    candidates: Optional[CandidateFinder] = None,
+    samples: int = 64,
+    probe_limit: int = 64,
+    seed: int = 0,
+) -> int:
+    """Choose the greedy-phase threshold *k* of :func:`compute_cluster`.
+
+    Runs bounded traversals from a random sample of seeds on a private visited
+    array, each stopping after *probe_limit* nodes.  A probe that runs out of
+    neighbours first has found a whole small component; the others belong to
+    components at least *probe_limit* large.  From these:
+
+    * if most probes close, *k* is the 90th percentile of the closed sizes,
+      so that typical small clusters finish in the greedy phase;
+    * otherwise the instance is dominated by large components and ``0`` is
+      returned, which skips the greedy phase.
+
+    Both phases of :func:`compute_cluster` now do the same work per node (no
+    member list is kept), so the threshold no longer changes the cost:
+    ``k="auto"`` mostly adds the cost of this probe, and the command line
+    only takes a fixed threshold.
+
+    The probe work is capped at about ``n / 16`` expansions, so the estimate
+    stays a small fraction of the full run whatever the engine.
+
+    Args:
+        distance: Maximum Euclidean distance that defines an edge.
+        points: Complete point set.
+        candidates: Neighbour engine (see :data:`ENGINES`).  Defaults to a
+            full scan.
+        samples: Maximum number of sampled seeds.
+        probe_limit: Node budget of a single probe.
+        seed: Seed of the sampling generator, for reproducible choices.
+
+    Returns:
+        The chosen threshold, ``0`` meaning "no greedy phase".
+    """
+    n = len(points)
+    if n == 0:
+        return 0
+    if candidates is None:
+        candidates = naive_candidates(distance, points)
+
+    visited = new_visited(points)
+    expand = _unvisited_neighbours(distance, points, visited, candidates)
+
+    budget = max(probe_limit, n // 16)
+    closed: List[int] = []
+    probes = 0
+    for start in random.Random(seed).sample(range(n), min(samples, n)):
+        if budget <= 0:
+            break
+        probes += 1
+        visited[start] = True
+        reached = [start]
+        stack = [start]
+        while stack and len(reached) < probe_limit and budget > 0:
+            budget -= 1
+            for neighbour in expand(stack.pop()):
+                visited[neighbour] = True
+                reached.append(neighbour)
+                stack.append(neighbour)
+        if not stack:
+            closed.append(len(reached))
+        elif len(reached) < probe_limit:
+            probes -= 1  # out of budget mid-probe: inconclusive
+        for index in reached:
+            visited[index] = False
+
+    if len(closed) * 2 <= probes:
+        return 0
+    return int(np.percentile(closed, 90))
 
 
-def load_instance(filename: str) -> Tuple[float, List[Point]]:
+def load_instance(
+    filename: str, as_array: bool = False
+) -> Tuple[float, Points]:
     """Load a ``.pts`` dataset file.
 
     The file format is::
@@ -31,99 +328,308 @@ def load_instance(filename: str) -> Tuple[float, List[Point]]:
         <x2>, <y2>
         ...
 
+    The file is parsed in bulk by :func:`pts_io.load_coordinates`; Point
+    objects are only built when a list is requested.
+
     Args:
         filename: Path to the ``.pts`` file.
+        as_array: When ``True``, return the points as a
+            :class:`~geo.point_array.PointArray` instead of a list.
 
     Returns:
         A tuple ``(distance, points)`` where *distance* is the maximum
         Euclidean distance that connects two points into the same component,
-        and *points* is the list of parsed :class:`~geo.point.Point` objects.
+        and *points* is the list of parsed :class:`~geo.point.Point` objects
+        (or their columnar store when *as_array* is set).
     """
-    with open(filename, "r") as instance_file:
-        lines = iter(instance_file)
-        distance = float(next(lines))
-        points = [Point([float(f) for f in line.split(",")]) for line in lines]
-
-    return distance, points
+    with timed("load"):
+        distance, coordinates = load_coordinates(filename)
+        points = PointArray(coordinates)
+        return distance, (points if as_array else points.to_points())
 
 
 def compute_cluster(
     start_index: int,
     distance: float,
-    points: List[Point],
-    visited: List[bool],
-    k: int = 8,
+    points: Points,
+    visited: Visited,
+    k: int = DEFAULT_K,
+    candidates: Optional[CandidateFinder] = None,
+    labels: Optional[np.ndarray] = None,
+    label: int = 0,
 ) -> int:
     """Compute the size of one connected component from a seed point.
 
     Uses a two-phase hybrid strategy:
 
     * **Phase 1 — Greedy expansion**: pop nodes from a stack and mark all
-      reachable neighbours as visited.  Stop as soon as the component has more
-      than *k* nodes — tiny isolated clusters are handled entirely here.
+      reachable neighbours as visited, a whole neighbour batch at a time.
+      Stop as soon as the component has more than *k* nodes — tiny isolated
+      clusters are handled entirely here.
     * **Phase 2 — Full iterative DFS**: for larger components, drain the
-      remaining stack while only incrementing a counter (no index list kept in
-      memory), which is more memory-efficient at scale.
+      remaining stack one neighbour at a time.
+
+    Neither phase keeps the member indices: only a counter and the stack, a
+    typed :class:`array.array` of machine integers (4 bytes per entry instead
+    of a pointer to a boxed int).
 
     Args:
         start_index: Index of the seed point in *points*.
         distance: Maximum Euclidean distance that defines an edge.
-        points: Complete list of points in the dataset.
-        visited: Shared boolean list managed across worker processes; ``True``
-            means the point has already been claimed by a component.
+        points: Complete list of points in the dataset, or a
+            :class:`~geo.point_array.PointArray` for vectorized distance tests.
+        visited: Visited flags shared across calls (see :func:`new_visited`);
+            a true entry means the point has already been claimed by a
+            component.  Must be a NumPy boolean array when *points* is a
+            ``PointArray``.
         k: Greedy-phase threshold.  When the component grows beyond *k* nodes
-            the algorithm switches to the pure counting DFS.
+            the algorithm switches to the pure counting DFS.  Both phases do
+            the same work per node, so *k* does not change the cost.
+        candidates: Neighbour engine returning the indices to test against a
+            given point (see :data:`ENGINES`).  Defaults to a full scan.
+        labels: Optional per-point label array; every point claimed by this
+            call is set to *label* as it is marked visited.
+        label: Label written into *labels*.
 
     Returns:
         Size of the discovered component, or ``0`` if *start_index* was already
         visited by another worker process before this call began.
     """
-    n = len(points)
+    if candidates is None:
+        candidates = naive_candidates(distance, points)
+    stats = active_stats()
+    expand = _unvisited_neighbours(distance, points, visited, candidates, stats)
 
     # Caller guarantees start_index is unvisited, but guard defensively.
     if visited[start_index]:
         return 0
 
     visited[start_index] = True
-    component: List[int] = [start_index]  # index accumulator for phase 1
-    stack: List[int] = [start_index]
+    if labels is not None:
+        labels[start_index] = label
+    component_size = 1
+    stack = _index_stack(len(points), start_index)
+    if stats is not None:
+        expand = stats.track_depth(expand, stack)
+        stats.components += 1
+        stats.max_stack_depth = max(stats.max_stack_depth, 1)
 
     # --- Phase 1: Greedy expansion ---
-    # Keep a full index list so we can restart DFS from any already-visited node.
+    # Only sizes are needed, so members are counted rather than collected.
     while stack:
-        if len(component) > k:
+        if component_size > k:
             break  # hand off to full DFS — component is large enough
-        current = stack.pop()
-        for neighbour in range(n):
-            if (
-                not visited[neighbour]
-                and points[current].distance_to(points[neighbour]) <= distance
-            ):
-                visited[neighbour] = True
-                component.append(neighbour)
-                stack.append(neighbour)
+        found = expand(stack.pop())
+        for neighbour in found:
+            visited[neighbour] = True
+        if labels is not None:
+            labels[found] = label
+        component_size += len(found)
+        stack.extend(found)
+
+    if stats is not None:
+        # Every claimed node is pushed and popped once: the greedy phase has
+        # expanded all of them so far except those still on the stack.
+        greedy_nodes = component_size - len(stack)
+        stats.greedy_nodes += greedy_nodes
 
     # --- Phase 2: Full iterative DFS ---
-    # Only the running count is maintained; individual indices are discarded.
-    component_size = len(component)
     while stack:
         current = stack.pop()
-        for neighbour in range(n):
-            if (
-                not visited[neighbour]
-                and points[current].distance_to(points[neighbour]) <= distance
-            ):
-                visited[neighbour] = True
-                component_size += 1
-                stack.append(neighbour)
+        found = expand(current)
+        for neighbour in found:
+            visited[neighbour] = True
+            component_size += 1
+            stack.append(neighbour)
+        if labels is not None:
+            labels[found] = label
+
+    if stats is not None:
+        stats.dfs_nodes += component_size - greedy_nodes
+    return component_size
+
+
+def compute_cluster_frontier(
+    start_index: int,
+    distance: float,
+    points: PointArray,
+    visited: np.ndarray,
+    candidates: Optional[CandidateFinder] = None,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    labels: Optional[np.ndarray] = None,
+    label: int = 0,
+) -> int:
+    """Compute the size of one connected component level by level.
+
+    Breadth-first variant of :func:`compute_cluster` for a columnar store:
+    each step takes the whole frontier (the points discovered by the previous
+    step), gathers the still-unvisited candidates of all its nodes, and tests
+    every frontier/candidate pair as one block of squared distances
+    (:meth:`~geo.point_array.PointArray.block_squared_distances`).  All hits
+    are marked at once and become the next frontier, so the interpreter runs
+    once per level rather than once per pair.
+
+    The block is split into row chunks of at most *block_elements* distances,
+    and candidates already hit by an earlier chunk are dropped from the next
+    ones.  The distance test matches :meth:`~geo.point.Point.distance_to`
+    exactly.
+
+    Args:
+        start_index: Index of the seed point in *points*.
+        distance: Maximum Euclidean distance that defines an edge.
+        points: Columnar point store.
+        visited: NumPy boolean visited flags shared across calls.
+        candidates: Neighbour engine (see :data:`ENGINES`).  ``None`` tests
+            every unvisited point, without building a per-node candidate
+            list.
+        block_elements: Cap on the size of one distance block.
+        labels: Optional per-point label array; every point claimed by this
+            call is set to *label*.
+        label: Label written into *labels*.
+
+    Returns:
+        Size of the discovered component, or ``0`` if *start_index* was
+        already visited.
+    """
+    if visited[start_index]:
+        return 0
+
+    r_squared = squared_radius(distance)
+    visited[start_index] = True
+    if labels is not None:
+        labels[start_index] = label
+    frontier = np.array([start_index])
+    component_size = 1
+
+    while len(frontier):
+        if candidates is None:
+            pool = np.flatnonzero(~visited)
+        else:
+            gathered = []
+            for node in frontier.tolist():
+                found_here = candidates(node)
+                if not isinstance(found_here, np.ndarray):
+                    found_here = np.fromiter(found_here, dtype=np.intp)
+                gathered.append(found_here)
+            pool = np.unique(np.concatenate(gathered).astype(np.intp, copy=False))
+            pool = pool[~visited[pool]]
+
+        found = []
+        rows = max(1, block_elements // max(1, len(pool)))
+        for start in range(0, len(frontier), rows):
+            if not len(pool):
+                break
+            block = points.block_squared_distances(frontier[start : start + rows], pool)
+            hit = (block <= r_squared).any(axis=0)
+            found.append(pool[hit])
+            pool = pool[~hit]
+
+        frontier = np.concatenate(found) if found else pool[:0]
+        visited[frontier] = True
+        if labels is not None:
+            labels[frontier] = label
+        component_size += len(frontier)
 
     return component_size
 
 
+def compute_component_labels(
+    distance: float,
+    points: Points,
+    engine: str = "naive",
+    k: Union[int, str] = DEFAULT_K,
+) -> np.ndarray:
+    """Label every point with the index of its connected component.
+
+    Runs the same seed loop as :func:`print_components_sizes`, with
+    :func:`compute_cluster` writing each claimed point's label as it goes, so
+    the cost is one extra store per point.  Components are numbered ``0, 1,
+    ...`` in order of their lowest point index.
+
+    Args:
+        distance: Maximum Euclidean distance that connects two points.
+        points: Complete list of points in the dataset, or a
+            :class:`~geo.point_array.PointArray`.
+        engine: Name of the neighbour engine in :data:`ENGINES`.
+        k: Greedy-phase threshold, or ``"auto"`` to pick it with
+            :func:`auto_tune_k`; *k* does not change the cost.
+
+    Returns:
+        ``int32`` array with one label per point; pass it to
+        :func:`sizes_from_labels` for the sorted sizes.
+
+    Raises:
+        ValueError: If *engine* is not a registered engine name, or *k* is
+            neither an integer nor ``"auto"``.
+    """
+    _check_options(engine, k)
+    n = len(points)
+    labels = np.full(n, -1, dtype=np.int32)
+    if n == 0:
+        return labels
+
+    visited = new_visited(points)
+    candidates = ENGINES[engine](distance, points)
+    if k == "auto":
+        k = auto_tune_k(distance, points, candidates)
+
+    label = 0
+    for i in range(n):
+        if not visited[i]:
+            compute_cluster(
+                i,
+                distance,
+                points,
+                visited,
+                k=k,
+                candidates=candidates,
+                labels=labels,
+                label=label,
+            )
+            label += 1
+    return labels
+
+
+def sizes_from_labels(labels: np.ndarray) -> List[int]:
+    """Return the component sizes of a label array, in descending order.
+
+    Args:
+        labels: Non-negative component labels, one per point (see
+            :func:`compute_component_labels`).
+
+    Returns:
+        Sizes sorted in descending order, as plain ``int`` values.
+    """
+    if len(labels) == 0:
+        return []
+    counts = np.bincount(labels)
+    return sorted(counts[counts > 0].tolist(), reverse=True)
+
+
+def _check_options(engine: str, k: Union[int, str]) -> None:
+    """Validate the *engine* and *k* options shared by the entry points.
+
+    Raises:
+        ValueError: If *engine* is not in :data:`ENGINES` or *k* is neither
+            an integer nor ``"auto"``.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown engine {engine!r}; expected one of {sorted(ENGINES)}."
+        )
+    if isinstance(k, str) and k != "auto":
+        raise ValueError(f"Invalid greedy threshold {k!r}; expected an int or 'auto'.")
+
+
 def print_components_sizes(
     distance: float,
-    points: List[Point],
+    points: Points,
     verbose: bool = True,
+    engine: str = "naive",
+    workers: int = 1,
+    k: Union[int, str] = DEFAULT_K,
+    frontier: bool = False,
+    jit: bool = False,
 ) -> List[int]:
     """Discover all connected components and (optionally) print their sizes.
 
@@ -135,36 +641,82 @@ def print_components_sizes(
     Note:
         Parallelising seed dispatch (e.g. with ``multiprocessing.Pool``) is
         unsound for this problem because workers race to claim the same
-        neighbours, fragmenting components that should be large.  The algorithmic
-        value here lies in the two-phase hybrid DFS inside
-        :func:`compute_cluster`, not in multi-process parallelism.
+        neighbours, fragmenting components that should be large.  With
+        ``workers > 1`` the work is split by *space* instead: see
+        :mod:`parallel_connectes`, which solves bounding-box tiles in separate
+        processes and merges components across tile borders.
 
     Args:
         distance: Maximum Euclidean distance that connects two points.
-        points: Complete list of points in the dataset.
+        points: Complete list of points in the dataset, or a
+            :class:`~geo.point_array.PointArray`.
         verbose: When ``True``, print the sorted sizes to stdout in the form
             ``[size1, size2, ...]``.
+        engine: Name of the neighbour engine in :data:`ENGINES`.  All engines
+            produce identical sizes; ``grid`` avoids the O(n²) scan.
+        workers: Number of processes.  Above ``1`` the tile-parallel solver
+            is used and *engine* is ignored; the sizes are unchanged.
+        k: Greedy-phase threshold passed to :func:`compute_cluster`, or
+            ``"auto"`` to pick it with :func:`auto_tune_k`; *k* does not
+            change the cost.
+        frontier: Explore each component level by level with
+            :func:`compute_cluster_frontier` (vectorized blocks) instead; a
+            point list is converted to a columnar store and *k* is unused.
+        jit: Run the compiled kernels of :mod:`jit_backend` (grid index,
+            *engine* ignored); without Numba this falls back to the ``grid``
+            engine in pure Python.
 
     Returns:
         Component sizes sorted in descending order.
+
+    Raises:
+        ValueError: If *engine* is not a registered engine name, or *k* is
+            neither an integer nor ``"auto"``.
     """
+    _check_options(engine, k)
+
     n = len(points)
     if n == 0:
         return []
 
-    # Plain list: visited flags shared within a single process (no IPC overhead)
-    visited: List[bool] = [False] * n
+    if workers > 1 or jit or frontier:
+        with timed("traversal"):
+            if workers > 1:
+                sizes = compute_component_sizes_parallel(distance, points, workers)
+            elif jit:
+                # deferred: jit_backend builds on this module (and Numba is
+                # slow to import when the backend is not used).
+                from jit_backend import compute_component_sizes_jit
+
+                sizes = compute_component_sizes_jit(distance, points, k, verbose=False)
+            else:
+                sizes = _frontier_component_sizes(distance, points, engine)
+        if verbose:
+            print("[" + ", ".join(map(str, sizes)) + "]")
+        return sizes
+
+    # One byte per point, shared by every compute_cluster call of this run.
+    visited = new_visited(points)
+    with timed("index"):
+        candidates = ENGINES[engine](distance, points)
+    if k == "auto":
+        with timed("tune"):
+            k = auto_tune_k(distance, points, candidates)
 
     sizes: List[int] = []
-    for i in range(n):
-        if not visited[i]:
-            # Each seed is fully explored before advancing — this guarantees
-            # no two calls ever race over the same point.
-            size = compute_cluster(i, distance, points, visited)
-            if size > 0:
-                sizes.append(size)
-
-    sizes.sort(reverse=True)
+    with timed("traversal"):
+        for i in range(n):
+            if not visited[i]:
+                # Each seed is fully explored before advancing — this
+                # guarantees no two calls ever race over the same point.
+                size = compute_cluster(
+                    i, distance, points, visited, k=k, candidates=candidates
+                )
+                if size > 0:
+                    sizes.append(size)
+
+    with timed("sort"):
+        sizes.sort(reverse=True)
 
     if verbose:
         print("[" + ", ".join(map(str, sizes)) + "]")
@@ -172,21 +724,209 @@ def print_components_sizes(
     return sizes
 
 
+def _frontier_component_sizes(
+    distance: float, points: Points, engine: str
+) -> List[int]:
+    """Run the seed loop of :func:`print_components_sizes` with
+    :func:`compute_cluster_frontier`.
+
+    Returns:
+        Component sizes sorted in descending order.
+    """
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    visited = np.zeros(len(points), dtype=bool)
+    # The naive engine needs no per-node candidates: the frontier is tested
+    # against every unvisited point directly.
+    candidates = None if engine == "naive" else ENGINES[engine](distance, points)
+
+    sizes = [
+        compute_cluster_frontier(i, distance, points, visited, candidates)
+        for i in range(len(points))
+        if not visited[i]
+    ]
+    sizes.sort(reverse=True)
+    return sizes
+
+
+def _greedy_threshold(value: str) -> int:
+    """Parse the ``--k`` option: a non-negative integer."""
+    try:
+        k = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if k < 0:
+        raise argparse.ArgumentTypeError(f"must be non-negative, got {k}")
+    return k
+
+
 def main() -> None:
     """Entry point: process one or more ``.pts`` files passed on the command line."""
-    instances = argv[1:]
-    if not instances:
-        print("Usage: python connectes.py file1.pts file2.pts ...")
+    parser = argparse.ArgumentParser(
+        description="Print connected-component sizes of .pts point sets."
+    )
+    parser.add_argument("instances", nargs="*", help=".pts files to process")
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default="naive",
+        help="neighbour lookup engine (default: naive)",
+    )
+    parser.add_argument(
+        "--array",
+        action="store_true",
+        help="load points into a columnar NumPy store (vectorized distances)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="solve spatial tiles in N processes (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--k",
+        type=_greedy_threshold,
+        default=DEFAULT_K,
+        help=f"greedy-phase threshold (default: {DEFAULT_K}); both phases cost the "
+        "same per node, so it does not change the run time",
+    )
+    parser.add_argument(
+        "--frontier",
+        action="store_true",
+        help="explore components level by level with vectorized distance blocks",
+    )
+    parser.add_argument(
+        "--jit",
+        action="store_true",
+        help="use the Numba-compiled kernels (pure-Python grid engine without Numba)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="solve up to N files at once in worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--completion-order",
+        action="store_true",
+        help="with --jobs, print each file as soon as it is done",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=parse_bytes,
+        metavar="SIZE",
+        help="with --jobs, cap the estimated memory of files in flight (e.g. 2G); "
+        "with --out-of-core, cap the memory of one run (default: 1G)",
+    )
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="stream files larger than memory through spatial tiles on disk",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always recompute instead of reusing cached results",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-phase times and traversal counters after each file "
+        "(sequential mode; bypasses the cache)",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="FILE",
+        help="also write the profiling stats of every file to FILE as JSON",
+    )
+    args = parser.parse_args()
+    profiling = args.profile or args.profile_json is not None
+    if profiling and args.jobs > 1:
+        parser.error("--profile and --profile-json cannot be combined with --jobs")
+
+    if not args.instances:
+        parser.print_usage()
         return
 
-    for filename in instances:
+    cache = None
+    if not (args.no_cache or profiling):
         try:
-            distance, points = load_instance(filename)
-            print(f"# {filename} ({len(points)} points)")
-            print_components_sizes(distance, points)
+            cache = ResultCache()
+        except OSError:
+            pass  # unusable cache directory: run without the cache
+    if args.jobs > 1:
+        results = run_batch(
+            args.instances,
+            jobs=args.jobs,
+            engine=args.engine,
+            k=args.k,
+            as_array=args.array,
+            ordered=not args.completion_order,
+            memory_budget=args.memory_budget,
+            cache=cache,
+            frontier=args.frontier,
+            jit=args.jit,
+        )
+        for result in results:
+            if result.error is not None:
+                print(f"Error processing {result.filename}: {result.error}")
+                continue
+            origin = ", cached" if result.cached else ""
+            print(
+                f"# {result.filename} ({result.points} points, "
+                f"{result.seconds * 1000:.2f} ms{origin})"
+            )
+            print("[" + ", ".join(map(str, result.sizes)) + "]")
+        return
+
+    reports = []
+    for filename in args.instances:
+        try:
+            if cache is not None:
+                key = cache.key(filename, engine=args.engine, k=args.k)
+                hit = cache.get(key)
+                if hit is not None:
+                    sizes, _ = hit
+                    print(f"# {filename} ({sum(sizes)} points)")
+                    print("[" + ", ".join(map(str, sizes)) + "]")
+                    continue
+
+            # The command line owns the process, so each file may reset the
+            # peak-RSS mark and report its own peak.
+            with profile(reset_peak=True) if profiling else nullcontext() as stats:
+                if args.out_of_core:
+                    with timed("out-of-core"):
+                        sizes = compute_component_sizes_out_of_core(
+                            filename, args.memory_budget or DEFAULT_MEMORY_BUDGET
+                        )
+                    print(f"# {filename} ({sum(sizes)} points)")
+                    print("[" + ", ".join(map(str, sizes)) + "]")
+                else:
+                    distance, points = load_instance(filename, as_array=args.array)
+                    print(f"# {filename} ({len(points)} points)")
+                    sizes = print_components_sizes(
+                        distance,
+                        points,
+                        engine=args.engine,
+                        workers=args.workers,
+                        k=args.k,
+                        frontier=args.frontier,
+                        jit=args.jit,
+                    )
+            if stats is not None:
+                print(stats.report())
+                reports.append({"filename": filename, **stats.to_dict()})
+            if cache is not None:
+                cache.put(key, sizes)
         except Exception as e:
             print(f"Error processing {filename}: {e}")
 
+    if args.profile_json:
+        with open(args.profile_json, "w") as handle:
+            json.dump(reports, handle, indent=2)
+
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 """
-Benchmark and visualise Classic DFS vs. Hybrid Greedy-DFS performance.
+Benchmark and visualise the connected-component algorithms.
 
-Scans the project directory for all ``exemple_*.pts`` files, runs both
-algorithms on each dataset, records wall-clock execution times, and produces a
-comparative performance curve (execution time vs. number of points).
+Scans the project directory for all ``exemple_*.pts`` files, runs every
+algorithm (classic DFS, hybrid with the naive scan, hybrid with the grid and
+sweep engines, union-find) on each dataset, records wall-clock execution
+times, and produces a comparative performance curve (execution time vs. number of points).
 """
 
 import glob
 import os
+import sys
 import time
+from functools import partial
 from typing import Callable, Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
@@ -17,45 +20,35 @@ import numpy as np
 
 from connectes import print_components_sizes
 from dfs_connectes import compute_component_sizes_dfs, load_instance
+from union_find import compute_component_sizes_union_find
 
 
 def visualize_components(
     points: List,
-    sizes: List[int],
+    labels: np.ndarray,
     title: str = "Connected Components",
 ) -> None:
     """Display a colour-coded scatter plot of the 2D point cloud.
 
-    Each component is assigned a distinct colour from the ``rainbow`` colormap.
-    Points are coloured in the same order they appear in *points*, assuming
-    *sizes* was produced by the same algorithm on the same dataset.
+    Each component is assigned a distinct colour from the ``rainbow`` colormap,
+    taken from the per-point component labels, so points may appear in any
+    order in the file.
 
     Args:
         points: List of :class:`~geo.point.Point` objects to plot.
-        sizes: Component sizes in descending order.  Used to build the
-            colour-index mapping: first ``sizes[0]`` points → colour 1, next
-            ``sizes[1]`` → colour 2, and so on.
+        labels: Component label of every point, as returned by
+            :func:`connectes.compute_component_labels`.
         title: Plot window title.
     """
-    if not points or not sizes:
+    if not points or len(labels) == 0:
         print(f"Nothing to visualise for '{title}'.")
         return
 
-    # Assign a colour index to every point based on which component it belongs to
-    colour_ids: List[int] = []
-    for component_id, size in enumerate(sizes, start=1):
-        colour_ids.extend([component_id] * size)
-
-    colours = plt.colormaps["rainbow"](np.linspace(0, 1, max(colour_ids) + 1))
+    coordinates = np.array([point.coordinates[:2] for point in points])
+    colours = plt.colormaps["rainbow"](np.linspace(0, 1, int(labels.max()) + 1))
 
     plt.figure(figsize=(8, 8))
-    for i, point in enumerate(points):
-        plt.scatter(
-            point.coordinates[0],
-            point.coordinates[1],
-            c=[colours[colour_ids[i]]],
-            s=10,
-        )
+    plt.scatter(coordinates[:, 0], coordinates[:, 1], c=colours[labels], s=10)
 
     plt.title(title)
     plt.xlabel("X")
@@ -99,9 +92,13 @@ def measure_performance(
 
 
 def main() -> None:
-    """Auto-detect example files, benchmark both algorithms, and plot results."""
+    """Auto-detect example files, benchmark all algorithms, and plot results.
+
+    Dataset paths given on the command line (e.g. larger files made with
+    ``generates_pts.py``) are benchmarked instead of the examples.
+    """
     repo_dir = os.path.dirname(__file__)
-    files = sorted(glob.glob(os.path.join(repo_dir, "exemple_*.pts")))
+    files = sys.argv[1:] or sorted(glob.glob(os.path.join(repo_dir, "exemple_*.pts")))
 
     if not files:
         print("No exemple_*.pts files found in the project directory.")
@@ -109,10 +106,21 @@ def main() -> None:
 
     algorithms = [
         ("Classic DFS", compute_component_sizes_dfs, None),
-        ("Hybrid Greedy-DFS (k=8)", print_components_sizes, 8),
+        ("Hybrid Greedy-DFS + naive", print_components_sizes, None),
+        (
+            "Hybrid Greedy-DFS + grid",
+            partial(print_components_sizes, engine="grid"),
+            None,
+        ),
+        (
+            "Hybrid Greedy-DFS + sweep",
+            partial(print_components_sizes, engine="sweep"),
+            None,
+        ),
+        ("Union-Find + grid", compute_component_sizes_union_find, None),
     ]
 
-    print("Benchmarking Classic DFS vs. Hybrid Greedy-DFS (k=8)\n")
+    print(f"Benchmarking {', '.join(name for name, _, _ in algorithms)}\n")
 
     performance_data: Dict[str, List[float]] = {name: [] for name, _, _ in algorithms}
     point_counts: List[int] = []
@@ -131,8 +139,10 @@ def main() -> None:
                 point_counts[-1] = len(points)
 
             # Uncomment to render a colour-coded scatter plot for each run:
+            # from connectes import compute_component_labels
+            # distance, _ = load_instance(filepath)
             # visualize_components(
-            #     points, sizes,
+            #     points, compute_component_labels(distance, points),
             #     f"{os.path.basename(filepath)} — {algo_name}"
             # )
 
@@ -145,7 +155,7 @@ def main() -> None:
 
     plt.xlabel("Number of points")
     plt.ylabel("Execution time (ms)")
-    plt.title("Classic DFS vs. Hybrid Greedy-DFS (k=8) — Performance Comparison")
+    plt.title("Connected-component algorithms — Performance Comparison")
     plt.legend()
     plt.grid(True)
     plt.tight_layout()
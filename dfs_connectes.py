@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Classic recursive DFS implementation for computing connected-component sizes.
+Classic DFS implementation for computing connected-component sizes.
 
 This module provides the baseline algorithm against which the Hybrid Greedy+DFS
 approach in ``connectes.py`` is benchmarked.  Two points belong to the same
@@ -8,13 +8,19 @@ component when their Euclidean distance is at most the threshold stored in the
 ``.pts`` file.
 """
 
-from sys import argv
-from typing import Dict, List, Optional, Tuple
+import argparse
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-from geo.point import Point
+import numpy as np
 
+from geo.point import Point, squared_radius
+from geo.point_array import PointArray
+from pts_io import load_coordinates
 
-def load_instance(filename: str) -> Tuple[Optional[float], List[Point]]:
+
+def load_instance(
+    filename: str, as_array: bool = False
+) -> Tuple[Optional[float], Union[List[Point], PointArray]]:
     """Load a ``.pts`` dataset file.
 
     The file format is::
@@ -24,8 +30,12 @@ def load_instance(filename: str) -> Tuple[Optional[float], List[Point]]:
         <x2>, <y2>
         ...
 
+    The file is parsed in bulk by :func:`pts_io.load_coordinates`.
+
     Args:
         filename: Path to the ``.pts`` file.
+        as_array: When ``True``, return the points as a
+            :class:`~geo.point_array.PointArray` instead of a list.
 
     Returns:
         A tuple ``(distance, points)`` on success.  Returns ``(None, [])``
@@ -33,90 +43,168 @@ def load_instance(filename: str) -> Tuple[Optional[float], List[Point]]:
         catching exceptions.
     """
     try:
-        with open(filename, "r") as instance_file:
-            lines = iter(instance_file)
-            distance = float(next(lines).strip())
-            points = [
-                Point([float(f) for f in line.split(",")])
-                for line in lines
-                if line.strip()
-            ]
-        return distance, points
+        distance, coordinates = load_coordinates(filename)
+        points = PointArray(coordinates)
+        if as_array:
+            return distance, points
+        return distance, points.to_points()
     except Exception as e:
         print(f"Error reading {filename}: {e}")
         return None, []
 
 
-def compute_component_sizes_dfs(distance: float, points: List[Point]) -> List[int]:
-    """Compute connected-component sizes with a classic recursive DFS.
-
-    Starting from each unvisited point a depth-first traversal explores all
-    reachable neighbours (i.e. those within *distance*) and collects them into
-    a component.  Visited points are removed from the working copy so they are
-    never seeded again.
-
-    Note:
-        Python's default recursion limit (``sys.setrecursionlimit``) may be
-        exceeded on large, densely connected datasets.  For those cases use the
-        iterative hybrid implementation in :mod:`connectes`.
+def _recursive_component_sizes(
+    n: int, reachable: Callable[[int], List[int]]
+) -> List[int]:
+    """Original recursive traversal: O(n) ``not in`` lookups and list removals.
 
     Args:
-        distance: Maximum Euclidean distance that defines an edge between two
-            points.
-        points: Complete list of points in the dataset.
+        n: Number of points.
+        reachable: Maps a point index to the indices within the threshold.
 
     Returns:
-        List of component sizes sorted in descending order.
+        Component sizes sorted in descending order.
     """
-    if not points:
-        print("[]")
-        return []
-
-    components: Dict[int, List[Point]] = {}
+    components: Dict[int, List[int]] = {}
 
-    def _dfs(
-        seed: Point,
-        all_points: List[Point],
-        visited: Optional[List[Point]] = None,
-    ) -> List[Point]:
-        """Recursively collect all points reachable from *seed*.
+    def _dfs(seed: int, visited: Optional[List[int]] = None) -> List[int]:
+        """Recursively collect the indices of all points reachable from *seed*.
 
         Args:
-            seed: The point currently being explored.
-            all_points: Complete point list used for neighbour lookup.
-            visited: Accumulator of points already confirmed in this component.
-                Initialised to ``[seed]`` on the first call.
+            seed: Index of the point currently being explored.
+            visited: Accumulator of indices already confirmed in this
+                component.  Initialised to ``[seed]`` on the first call.
 
         Returns:
-            Final list of every point in the component that contains *seed*.
+            Final list of every point index in the component containing *seed*.
         """
         if visited is None:
             visited = [seed]
-        for candidate in all_points:
+        for candidate in reachable(seed):
             # A candidate joins this component if it is within reach and not
             # yet assigned — checking membership via ``not in`` is O(n) but
             # acceptable for the dataset sizes targeted here.
-            if seed.distance_to(candidate) <= distance and candidate not in visited:
+            if candidate not in visited:
                 visited.append(candidate)
-                _dfs(candidate, all_points, visited)
+                _dfs(candidate, visited)
         return visited
 
     component_id = 0
-    remaining = points.copy()  # working copy — shrinks as components are found
+    remaining = list(range(n))  # working copy — shrinks as components are found
     while remaining:
         seed = remaining[0]
-        components[component_id] = _dfs(seed, points)
+        components[component_id] = _dfs(seed)
         # Remove every discovered point from the unvisited pool
-        for point in components[component_id]:
-            if point in remaining:
-                remaining.remove(point)
+        for index in components[component_id]:
+            if index in remaining:
+                remaining.remove(index)
         component_id += 1
 
-    sizes = sorted((len(comp) for comp in components.values()), reverse=True)
+    return sorted((len(comp) for comp in components.values()), reverse=True)
+
+
+def _iterative_component_sizes(
+    n: int, reachable: Callable[[int], List[int]]
+) -> List[int]:
+    """Explicit-stack traversal with an index-based visited bitmap.
+
+    Each point is pushed at most once and flagged in a ``bytearray``, so
+    memory is linear and the only super-linear cost left is the exhaustive
+    neighbour scan of the classic algorithm (O(n) per point).
+
+    Args:
+        n: Number of points.
+        reachable: Maps a point index to the indices within the threshold.
+
+    Returns:
+        Component sizes sorted in descending order.
+    """
+    visited = bytearray(n)
+    sizes: List[int] = []
+    for seed in range(n):
+        if visited[seed]:
+            continue
+        visited[seed] = 1
+        stack = [seed]
+        size = 0
+        while stack:
+            current = stack.pop()
+            size += 1
+            for candidate in reachable(current):
+                if not visited[candidate]:
+                    visited[candidate] = 1
+                    stack.append(candidate)
+        sizes.append(size)
+
+    sizes.sort(reverse=True)
+    return sizes
+
+
+def compute_component_sizes_dfs(
+    distance: float,
+    points: Union[List[Point], PointArray],
+    recursive: bool = False,
+    verbose: bool = True,
+) -> List[int]:
+    """Compute connected-component sizes with a classic DFS.
+
+    Starting from each unvisited point a depth-first traversal explores all
+    reachable neighbours (i.e. those within *distance*) by scanning every
+    point, with no spatial index.  A :class:`~geo.point_array.PointArray` is
+    used directly: each explored point tests all others in one vectorized
+    pass.
+
+    By default the traversal uses an explicit stack and a visited bitmap
+    (O(n) memory, O(n²) distance tests).  ``recursive=True`` selects the
+    original formulation, which recurses once per point, checks membership
+    with ``not in`` on a list and removes visited points from a working copy
+    (O(n³) worst case).
+
+    Note:
+        In recursive mode, Python's default recursion limit
+        (``sys.setrecursionlimit``) may be exceeded on large, densely
+        connected datasets.
+
+    Args:
+        distance: Maximum Euclidean distance that defines an edge between two
+            points.
+        points: Complete list of points in the dataset, or their columnar
+            store.
+        recursive: Use the original recursive traversal.
+        verbose: When ``True``, print the sorted sizes to stdout in the form
+            ``[size1, size2, ...]``.
+
+    Returns:
+        List of component sizes sorted in descending order.
+    """
+    if len(points) == 0:
+        if verbose:
+            print("[]")
+        return []
+
+    n = len(points)
+
+    r_squared = squared_radius(distance)
+
+    if isinstance(points, PointArray):
+        # Columnar store: one vectorized squared-distance pass per explored point.
+        everything = np.arange(n)
+
+        def _reachable(seed: int) -> List[int]:
+            return points.within(seed, everything, r_squared).tolist()
 
-    if not sizes:
-        print("[]")
     else:
+
+        def _reachable(seed: int) -> List[int]:
+            within = points[seed].within
+            return [j for j in range(n) if within(points[j], r_squared)]
+
+    if not recursive:
+        sizes = _iterative_component_sizes(n, _reachable)
+    else:
+        sizes = _recursive_component_sizes(n, _reachable)
+
+    if verbose:
         print("[" + ", ".join(map(str, sizes)) + "]")
 
     return sizes
@@ -124,15 +212,31 @@ def compute_component_sizes_dfs(distance: float, points: List[Point]) -> List[in
 
 def main() -> None:
     """Entry point: process one or more ``.pts`` files passed on the command line."""
-    if len(argv) < 2:
-        print("Usage: python dfs_connectes.py file.pts")
+    parser = argparse.ArgumentParser(
+        description="Print connected-component sizes using the classic DFS."
+    )
+    parser.add_argument("instances", nargs="*", help=".pts files to process")
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="use the original recursive traversal (small inputs only)",
+    )
+    parser.add_argument(
+        "--array",
+        action="store_true",
+        help="load points into a columnar NumPy store (vectorized distances)",
+    )
+    args = parser.parse_args()
+
+    if not args.instances:
+        parser.print_usage()
         return
 
-    for filename in argv[1:]:
-        distance, points = load_instance(filename)
+    for filename in args.instances:
+        distance, points = load_instance(filename, as_array=args.array)
         if distance is not None:
             print(f"# {filename} ({len(points)} points)")
-            compute_component_sizes_dfs(distance, points)
+            compute_component_sizes_dfs(distance, points, recursive=args.recursive)
 
 
 if __name__ == "__main__":
@@ -1,62 +1,206 @@
 #!/usr/bin/env python3
 """
-Generate synthetic ``.pts`` dataset files with uniformly random 2D points.
+Generate synthetic ``.pts`` dataset files of random 2D points.
 
-Each point is drawn independently from [0, 1] × [0, 1].  The output file
-starts with the distance threshold on the first line, followed by one
-``x, y`` coordinate pair per line.
+Points are drawn in vectorized blocks from a seeded NumPy generator and each
+block is written as one large chunk, so memory use stays at one block and
+10 million points take seconds.  The output file starts with the distance
+threshold on the first line, followed by one ``x, y`` coordinate pair per
+line.  An output name ending in ``.ptb`` produces the binary format of
+:mod:`pts_io` instead.
+
+Several distributions over the unit square are available (see
+:data:`DISTRIBUTIONS`), to exercise realistic component shapes:
+
+* ``uniform`` — independent uniform noise;
+* ``blobs`` — Gaussian blobs of various widths;
+* ``filaments`` — thin segments with a Gaussian cross-section;
+* ``mixed`` — a uniform background plus blobs and filaments whose widths
+  span two orders of magnitude, i.e. several density scales in one file.
+
+Clustered points that fall outside the square wrap around (a torus), so the
+edges do not collect extra points.
 
 Usage::
 
     python generates_pts.py <num_points> <output_file> [distance]
+        [--distribution uniform|blobs|filaments|mixed] [--clusters N] [--seed S]
 
 Example::
 
     python generates_pts.py 200 exemple_5.pts 0.05
+    python generates_pts.py 10000000 big.ptb 0.0005 --distribution mixed --seed 1
 """
 
+import argparse
 import os
-import random
-import sys
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from pts_io import DEFAULT_BLOCK_ROWS, write_ptb_blocks
+
+#: Point distributions accepted by :func:`generate_pts_file`.
+DISTRIBUTIONS = ("uniform", "blobs", "filaments", "mixed")
+
 
+def _clusters(
+    rng: np.random.Generator, distribution: str, clusters: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+    """Draw the cluster layout of a distribution.
 
-def generate_pts_file(filename: str, num_points: int, distance: float = 0.1) -> None:
-    """Write a ``.pts`` file containing random 2D points.
+    Each cluster is a segment ``start + t * vector`` (``t`` uniform in
+    ``[0, 1]``; a zero vector for a blob) blurred by a Gaussian of width
+    *sigma*.
+
+    Returns:
+        ``(starts, vectors, sigmas, weights, background)``: per-cluster
+        arrays, the cluster probabilities, and the probability of a uniform
+        background point.
+    """
+    if distribution == "uniform":
+        return np.zeros((0, 2)), np.zeros((0, 2)), np.zeros(0), np.zeros(0), 1.0
+
+    blobs = {"blobs": clusters, "filaments": 0, "mixed": clusters // 2}[distribution]
+    filaments = clusters - blobs
+    starts = rng.random((clusters, 2))
+    vectors = np.zeros((clusters, 2))
+    sigmas = np.empty(clusters)
+
+    # Widths are log-uniform; a mixed file spans two orders of magnitude.
+    wide = distribution == "mixed"
+    narrowest, widest = (0.002, 0.1) if wide else (0.005, 0.05)
+    sigmas[:blobs] = np.exp(rng.uniform(np.log(narrowest), np.log(widest), blobs))
+    angles = rng.uniform(0, 2 * np.pi, filaments)
+    lengths = rng.uniform(0.1, 0.5, filaments)
+    directions = np.column_stack((np.cos(angles), np.sin(angles)))
+    vectors[blobs:] = lengths[:, None] * directions
+    sigmas[blobs:] = np.exp(rng.uniform(np.log(0.001), np.log(0.005), filaments))
+
+    background = 0.2 if wide else 0.0
+    weights = rng.random(clusters) + 0.5
+    weights *= (1 - background) / weights.sum()
+    return starts, vectors, sigmas, weights, background
+
+
+def point_blocks(
+    num_points: int,
+    distribution: str = "uniform",
+    seed: Optional[int] = None,
+    clusters: int = 16,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> Iterator[np.ndarray]:
+    """Draw random points block by block.
+
+    The output is reproducible for a given seed and block size.
+
+    Args:
+        num_points: Total number of points.
+        distribution: One of :data:`DISTRIBUTIONS`.
+        seed: Seed for a private :func:`numpy.random.default_rng`; ``None``
+            seeds from the operating system.
+        clusters: Number of blobs and/or filaments.
+        block_rows: Points per block.
+
+    Yields:
+        ``(m, 2)`` ``float64`` arrays in the unit square.
+
+    Raises:
+        ValueError: If *distribution* is unknown.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(
+            f"Unknown distribution {distribution!r}; expected one of {DISTRIBUTIONS}."
+        )
+    rng = np.random.default_rng(seed)
+    starts, vectors, sigmas, weights, background = _clusters(
+        rng, distribution, max(1, clusters)
+    )
+    choices = np.append(weights, background)
+
+    for first in range(0, num_points, block_rows):
+        rows = min(block_rows, num_points - first)
+        if background == 1.0:
+            yield rng.random((rows, 2))
+            continue
+        picked = rng.choice(len(choices), size=rows, p=choices)
+        noise = picked == len(weights)
+        cluster = np.where(noise, 0, picked)
+        block = (
+            starts[cluster]
+            + rng.random((rows, 1)) * vectors[cluster]
+            + sigmas[cluster, None] * rng.standard_normal((rows, 2))
+        )
+        block[noise] = rng.random((int(noise.sum()), 2))
+        yield np.mod(block, 1.0, out=block)
+
+
+def generate_pts_file(
+    filename: str,
+    num_points: int,
+    distance: float = 0.1,
+    seed: Optional[int] = None,
+    distribution: str = "uniform",
+    clusters: int = 16,
+) -> None:
+    """Write a ``.pts`` (or binary ``.ptb``) file containing random 2D points.
 
     Args:
         filename: Output file path (absolute or relative to the script directory).
+            A ``.ptb`` suffix selects the binary format.
         num_points: Number of random points to generate.
         distance: Distance threshold written to the first line of the file.
             Two points whose Euclidean distance is ≤ this value will be
             considered connected.  Defaults to ``0.1``.
+        seed: Seed for a private random generator, for reproducible files.
+            ``None`` seeds from the operating system.
+        distribution: One of :data:`DISTRIBUTIONS`.
+        clusters: Number of blobs and/or filaments of a clustered
+            distribution.
     """
+    blocks = point_blocks(num_points, distribution, seed, clusters)
+    if filename.endswith(".ptb"):
+        write_ptb_blocks(filename, distance, 2, blocks)
+        print(f"Generated: {filename} ({num_points} points, distance={distance})")
+        return
+
     with open(filename, "w") as f:
         # First line: the distance threshold consumed by the algorithm scripts
         f.write(f"{distance}\n")
-        for _ in range(num_points):
-            x = random.random()
-            y = random.random()
-            f.write(f"{x}, {y}\n")
+        for block in blocks:
+            # One C-level formatting call per block (repr keeps full precision).
+            f.write("%r, %r\n" * len(block) % tuple(block.ravel().tolist()))
 
     print(f"Generated: {filename} ({num_points} points, distance={distance})")
 
 
 def main() -> None:
     """Parse command-line arguments and generate the ``.pts`` file."""
-    if len(sys.argv) < 3:
-        print("Usage: python generates_pts.py <num_points> <output_file> [distance]")
-        sys.exit(1)
-
-    num_points = int(sys.argv[1])
-    output_file = sys.argv[2]
-    distance = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+    parser = argparse.ArgumentParser(description="Generate a random .pts dataset.")
+    parser.add_argument("num_points", type=int)
+    parser.add_argument("output_file", help="a .ptb suffix writes the binary format")
+    parser.add_argument("distance", type=float, nargs="?", default=0.1)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform")
+    parser.add_argument(
+        "--clusters", type=int, default=16, help="blobs/filaments (default: 16)"
+    )
+    parser.add_argument("--seed", type=int, help="seed for a reproducible file")
+    args = parser.parse_args()
 
     # Resolve relative paths against the script's own directory so the file
     # lands next to the other example datasets regardless of the working directory.
+    output_file = args.output_file
     if not os.path.isabs(output_file):
         output_file = os.path.join(os.path.dirname(__file__), output_file)
 
-    generate_pts_file(output_file, num_points, distance)
+    generate_pts_file(
+        output_file,
+        args.num_points,
+        args.distance,
+        seed=args.seed,
+        distribution=args.distribution,
+        clusters=args.clusters,
+    )
 
 
 if __name__ == "__main__":
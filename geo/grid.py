@@ -0,0 +1,175 @@
+"""
+Uniform-grid spatial hash for fixed-radius neighbour lookup.
+
+Points are bucketed into axis-aligned cubic cells whose side equals the query
+radius.  Any two points within that radius of each other then lie in the same
+cell or in directly adjacent cells, so a neighbour query only has to inspect
+``3 ** dimension`` buckets (9 in 2D) instead of the whole point set.
+"""
+
+from __future__ import annotations
+
+from itertools import combinations, product
+from math import floor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from geo.point import Point
+
+Cell = Tuple[int, ...]
+
+
+class Grid:
+    """A hash map from integer cell coordinates to the indices of the points
+    that fall inside each cell.
+
+    Examples:
+        Bucket a small point set and list the candidates near point ``0``::
+
+            grid = Grid(points, 0.1)
+            for j in grid.candidates(0):
+                ...
+    """
+
+    def __init__(
+        self,
+        points: Sequence[Point],
+        cell_size: float,
+        dimension: Optional[int] = None,
+    ) -> None:
+        """Bucket every point into its grid cell.
+
+        Args:
+            points: Indexed point set; each entry must expose ``coordinates``.
+            cell_size: Side length of one cell.  Use the connection distance so
+                that the adjacent-cell rule is exact.  A non-positive value
+                (only identical points connect) falls back to ``1.0``.
+            dimension: Space dimension, required only when *points* is empty
+                and more points will be added with :meth:`insert`.
+        """
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+        self.cells: Dict[Cell, List[int]] = {}
+        self.point_cells: List[Cell] = []
+
+        if len(points):
+            dimension = len(points[0].coordinates)
+        elif dimension is None:
+            dimension = 0
+        self.offsets: List[Cell] = list(product((-1, 0, 1), repeat=dimension))
+        # Lexicographically positive half: visits every adjacent cell pair once.
+        origin = (0,) * dimension
+        self.forward_offsets: List[Cell] = [o for o in self.offsets if o > origin]
+
+        for index, point in enumerate(points):
+            cell = self.cell_of(point.coordinates)
+            self.point_cells.append(cell)
+            self.cells.setdefault(cell, []).append(index)
+
+    def cell_of(self, coordinates: Sequence[float]) -> Cell:
+        """Return the integer coordinates of the cell containing a position.
+
+        Args:
+            coordinates: Position in the same space as the indexed points.
+
+        Returns:
+            Tuple of cell indices, one per dimension.
+        """
+        size = self.cell_size
+        return tuple(floor(c / size) for c in coordinates)
+
+    def insert(self, coordinates: Sequence[float]) -> int:
+        """Bucket one more point, indexed after every existing one.
+
+        Args:
+            coordinates: Position of the new point.
+
+        Returns:
+            Index of the new point.
+        """
+        index = len(self.point_cells)
+        cell = self.cell_of(coordinates)
+        self.point_cells.append(cell)
+        self.cells.setdefault(cell, []).append(index)
+        return index
+
+    def remove(self, index: int) -> None:
+        """Take point *index* out of its bucket.
+
+        Other indices are unchanged; the point is simply never returned as a
+        candidate again.  Its own cell stays recorded, so :meth:`candidates`
+        can still be queried around it.
+
+        Args:
+            index: Index of a bucketed point.
+        """
+        cell = self.point_cells[index]
+        bucket = self.cells[cell]
+        bucket.remove(index)
+        if not bucket:
+            del self.cells[cell]
+
+    def candidates(self, index: int) -> Iterator[int]:
+        """Yield the indices of every point in the cell of point *index* and
+        in all cells adjacent to it.
+
+        The result is a superset of the true neighbours: callers still have to
+        apply the distance test.
+
+        Args:
+            index: Index of the query point in the indexed point set.
+
+        Yields:
+            Candidate point indices (the query point itself included).
+        """
+        cells = self.cells
+        for cell in self.adjacent_cells(self.point_cells[index]):
+            bucket = cells.get(cell)
+            if bucket is not None:
+                yield from bucket
+
+    def adjacent_cells(self, cell: Cell) -> Iterator[Cell]:
+        """Yield *cell* and its ``3 ** dimension - 1`` neighbouring cells.
+
+        Args:
+            cell: Integer cell coordinates.
+
+        Yields:
+            Cell coordinate tuples.
+        """
+        for offset in self.offsets:
+            yield tuple(c + o for c, o in zip(cell, offset))
+
+    def neighbouring_buckets(self) -> Iterator[Tuple[List[int], List[int]]]:
+        """Yield every pair of adjacent non-empty buckets exactly once.
+
+        Each non-empty bucket is first paired with itself, then with each of
+        its non-empty neighbours in the "forward" half of the neighbourhood,
+        so that no unordered pair of cells is produced twice.
+
+        Yields:
+            ``(bucket_a, bucket_b)`` index lists; both are the same list
+            object when a cell is paired with itself.
+        """
+        cells = self.cells
+        for cell, bucket in cells.items():
+            yield bucket, bucket
+            for offset in self.forward_offsets:
+                other = cells.get(tuple(c + o for c, o in zip(cell, offset)))
+                if other is not None:
+                    yield bucket, other
+
+    def candidate_pairs(self) -> Iterator[Tuple[int, int]]:
+        """Yield every unordered pair of points lying in the same or in
+        adjacent cells exactly once.
+
+        Like :meth:`candidates`, this is a superset of the true edges: callers
+        still have to apply the distance test.
+
+        Yields:
+            ``(i, j)`` index pairs with ``i != j``.
+        """
+        for bucket_a, bucket_b in self.neighbouring_buckets():
+            if bucket_a is bucket_b:
+                yield from combinations(bucket_a, 2)
+            else:
+                yield from product(bucket_a, bucket_b)
@@ -0,0 +1,201 @@
+"""
+KD-tree spatial index with fixed-radius queries.
+
+The tree is stored in flat arrays rather than node objects: node ``k`` covers
+the slice ``indices[start[k]:end[k]]`` of a permutation of the point indices,
+and its children are ``left[k]`` and ``right[k]`` (``-1`` for a leaf).  Every
+node also keeps its :class:`~geo.quadrant.Quadrant` bounding box, which is
+what radius queries use to prune whole subtrees.
+
+Works in any dimension supported by :class:`~geo.point.Point`.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from geo.point import Point, squared_radius
+from geo.point_array import PointArray
+from geo.quadrant import Quadrant
+
+# Rounding allowance on box pruning, so that a box is never discarded when a
+# point inside it passes the exact distance test.
+_MARGIN = 1 + 1e-9
+
+
+class KDTree:
+    """A static KD-tree over an indexed point set.
+
+    Built in O(n log n): each level splits every node at the median of its
+    widest axis with a linear-time partition.
+
+    Examples:
+        Find every point within ``0.1`` of point ``0``::
+
+            tree = KDTree(points)
+            tree.query_radius(points[0].coordinates, 0.1)
+    """
+
+    def __init__(
+        self,
+        points: Union[Sequence[Point], PointArray],
+        leaf_size: int = 16,
+    ) -> None:
+        """Build the tree.
+
+        Args:
+            points: Indexed point set (list of points or columnar store).
+            leaf_size: Maximum number of points stored in a leaf.
+        """
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(list(points))
+        self.points = points
+        self.coordinates = points.coordinates
+        self.leaf_size = max(1, leaf_size)
+
+        self.indices = np.arange(len(points))
+        self.start: List[int] = []
+        self.end: List[int] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.boxes: List[Quadrant] = []
+
+        if len(points):
+            self._build()
+
+    def _new_node(self, start: int, end: int) -> int:
+        """Append a node covering ``indices[start:end]`` and return its id."""
+        block = self.coordinates[self.indices[start:end]]
+        self.start.append(start)
+        self.end.append(end)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.boxes.append(
+            Quadrant(block.min(axis=0).tolist(), block.max(axis=0).tolist())
+        )
+        return len(self.start) - 1
+
+    def _build(self) -> None:
+        """Split nodes at the median of their widest axis until leaves are
+        small enough."""
+        indices = self.indices
+        pending = [self._new_node(0, len(indices))]
+        while pending:
+            node = pending.pop()
+            start, end = self.start[node], self.end[node]
+            if end - start <= self.leaf_size:
+                continue
+
+            box = self.boxes[node]
+            extents = [
+                hi - lo for lo, hi in zip(box.min_coordinates, box.max_coordinates)
+            ]
+            axis = int(np.argmax(extents))
+            if extents[axis] == 0:
+                continue  # all points coincide: keep them in one leaf
+
+            mid = (start + end) // 2
+            members = indices[start:end]
+            order = np.argpartition(self.coordinates[members, axis], mid - start)
+            indices[start:end] = members[order]
+
+            self.left[node] = self._new_node(start, mid)
+            self.right[node] = self._new_node(mid, end)
+            pending.append(self.left[node])
+            pending.append(self.right[node])
+
+    def query_radius(self, coordinates: Sequence[float], r: float) -> np.ndarray:
+        """Return the indices of every point within *r* of a position.
+
+        The distance test is exact with respect to
+        :meth:`~geo.point.Point.distance_to`: a point is reported if and only
+        if its distance to *coordinates* is ``<= r``.
+
+        Args:
+            coordinates: Query position.
+            r: Query radius.
+
+        Returns:
+            Index array in original point order (unsorted).
+        """
+        if not self.start:
+            return np.empty(0, dtype=np.intp)
+
+        origin = np.asarray(coordinates, dtype=np.float64)
+        target = Quadrant(origin.tolist(), origin.tolist())
+        reach = r * _MARGIN
+        r_squared = squared_radius(r)
+
+        found: List[np.ndarray] = []
+        pending = [0]
+        while pending:
+            node = pending.pop()
+            if self.boxes[node].distance_to(target) > reach:
+                continue
+            if self.left[node] != -1:
+                pending.append(self.left[node])
+                pending.append(self.right[node])
+                continue
+
+            members = self.indices[self.start[node] : self.end[node]]
+            total = self.points.squared_distances_from(origin, members)
+            found.append(members[total <= r_squared])
+
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(found)
+
+    def query_pairs(self, r: float) -> Iterator[Tuple[int, int]]:
+        """Yield every unordered pair of indexed points within *r* exactly once.
+
+        Pairs of nodes are explored together (dual-tree traversal): a node
+        pair is discarded as soon as its two boxes are farther apart than *r*,
+        and leaf pairs are tested as one vectorized block.
+
+        Args:
+            r: Query radius.
+
+        Yields:
+            ``(i, j)`` index pairs with ``i != j``.
+        """
+        if not self.start:
+            return
+
+        reach = r * _MARGIN
+        r_squared = squared_radius(r)
+        pending = [(0, 0)]
+        while pending:
+            a, b = pending.pop()
+            if a != b and self.boxes[a].distance_to(self.boxes[b]) > reach:
+                continue
+
+            a_leaf = self.left[a] == -1
+            b_leaf = self.left[b] == -1
+            if a_leaf and b_leaf:
+                yield from self._leaf_pairs(a, b, r_squared)
+            elif a == b:
+                left, right = self.left[a], self.right[a]
+                pending.extend(((left, left), (right, right), (left, right)))
+            elif a_leaf or (not b_leaf and self._size(b) > self._size(a)):
+                # Descend into the larger (or only splittable) node.
+                pending.extend(((a, self.left[b]), (a, self.right[b])))
+            else:
+                pending.extend(((self.left[a], b), (self.right[a], b)))
+
+    def _size(self, node: int) -> int:
+        """Return the number of points covered by *node*."""
+        return self.end[node] - self.start[node]
+
+    def _leaf_pairs(
+        self, a: int, b: int, r_squared: float
+    ) -> Iterator[Tuple[int, int]]:
+        """Yield the close pairs between two leaves (or within one leaf)."""
+        rows_a = self.indices[self.start[a] : self.end[a]]
+        rows_b = self.indices[self.start[b] : self.end[b]]
+        hits = self.points.block_squared_distances(rows_a, rows_b) <= r_squared
+        if a == b:
+            hits = np.triu(hits, k=1)
+        left, right = np.nonzero(hits)
+        yield from zip(rows_a[left].tolist(), rows_b[right].tolist())
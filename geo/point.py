@@ -4,12 +4,39 @@ N-dimensional point with Euclidean geometry helpers.
 
 from __future__ import annotations
 
-from math import sqrt
+from math import inf, nextafter, sqrt
 from typing import List
 
 from geo.quadrant import Quadrant
 
 
+def squared_radius(distance: float) -> float:
+    """Return the squared-distance threshold equivalent to *distance*.
+
+    ``distance * distance`` is rounded, so comparing a squared distance
+    against it can disagree with ``sqrt(total) <= distance`` on boundary pairs.
+    This returns the largest float ``t`` such that ``sqrt(t) <= distance``,
+    which makes ``total <= t`` and ``sqrt(total) <= distance`` equivalent for
+    every non-negative ``total``.
+
+    Args:
+        distance: Non-negative connection threshold.
+
+    Returns:
+        The exact squared threshold to compare squared distances against.
+    """
+    if distance < 0:
+        return -1.0
+    if distance == inf:
+        return inf
+    threshold = distance * distance
+    while sqrt(threshold) > distance:
+        threshold = nextafter(threshold, 0.0)
+    while sqrt(nextafter(threshold, inf)) <= distance:
+        threshold = nextafter(threshold, inf)
+    return threshold
+
+
 class Point:
     """An N-dimensional point represented as a vector of floating-point coordinates.
 
@@ -19,8 +46,13 @@ class Point:
             p1 = Point([2.0, 5.0])
             p2 = Point([5.0, 9.0])
             print(p1.distance_to(p2))  # 5.0
+
+        In hot loops that only compare against a threshold, prefer
+        :meth:`within` with a precomputed :func:`squared_radius`.
     """
 
+    __slots__ = ("coordinates",)
+
     def __init__(self, coordinates: List[float]) -> None:
         """Initialise the point from a coordinate list.
 
@@ -61,6 +93,46 @@ class Point:
 
         return sqrt(total)
 
+    def squared_distance_to(self, other: "Point") -> float:
+        """Compute the squared Euclidean distance to *other*.
+
+        Accumulates the same terms in the same order as :meth:`distance_to`,
+        without the ordering dispatch and without the final ``sqrt``.
+
+        Args:
+            other: The target point.
+
+        Returns:
+            Non-negative squared distance.
+        """
+        total = 0.0
+        for c1, c2 in zip(self.coordinates, other.coordinates):
+            diff = c1 - c2
+            total += diff * diff
+        return total
+
+    def within(self, other: "Point", r_squared: float) -> bool:
+        """Test whether *other* lies within a squared radius of this point.
+
+        With ``r_squared = squared_radius(distance)`` the answer is identical
+        to ``self.distance_to(other) <= distance`` for every pair of points.
+
+        Args:
+            other: The target point.
+            r_squared: Squared-distance threshold.
+
+        Returns:
+            ``True`` if the squared distance is at most *r_squared*.
+        """
+        # Same loop as squared_distance_to, inlined: this is the per-pair
+        # test of the traversal loops, and the extra method call would cost
+        # about 10% per test.
+        total = 0.0
+        for c1, c2 in zip(self.coordinates, other.coordinates):
+            diff = c1 - c2
+            total += diff * diff
+        return total <= r_squared
+
     def bounding_quadrant(self) -> Quadrant:
         """Return the tightest axis-aligned bounding box containing this point.
 
@@ -149,7 +221,7 @@ class Point:
 
     def __lt__(self, other: "Point") -> bool:
         """Lexicographical ordering used to guarantee a canonical call direction
-        in :meth:`distance_to`.
+        in :meth:`distance_to` (the :meth:`within` fast path does not need it).
 
         Args:
             other: Point to compare against.
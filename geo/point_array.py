@@ -0,0 +1,202 @@
+"""
+Columnar point store backed by a contiguous NumPy array.
+
+A :class:`PointArray` keeps all coordinates in one ``float64`` array of shape
+``(n, dimension)`` — 16 bytes per point in 2D instead of a full
+:class:`~geo.point.Point` object and its coordinate list — and answers
+distance tests for many candidates at once.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List, Sequence
+
+import numpy as np
+
+from geo.point import Point
+from geo.quadrant import Quadrant
+
+
+class PointArray:
+    """An indexed set of N-dimensional points stored row-wise in one array.
+
+    Examples:
+        Wrap three 2D points and find the ones close to the first::
+
+            pa = PointArray([[0.0, 0.0], [0.1, 0.0], [5.0, 5.0]])
+            pa.within(0, np.arange(3), squared_radius(0.2))  # array([0, 1])
+    """
+
+    def __init__(self, coordinates: Sequence[Sequence[float]]) -> None:
+        """Initialise the store from an ``(n, dimension)`` array-like.
+
+        Args:
+            coordinates: One row of coordinates per point.  The data is
+                converted to a C-contiguous ``float64`` array (no copy when it
+                already is one).
+
+        Raises:
+            ValueError: If *coordinates* is not two-dimensional.
+        """
+        self.coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+        if self.coordinates.ndim != 2:
+            raise ValueError(
+                "PointArray expects an (n, dimension) array, "
+                f"got shape {self.coordinates.shape}."
+            )
+
+    @classmethod
+    def from_points(cls, points: Sequence[Point]) -> "PointArray":
+        """Build a store from a list of :class:`~geo.point.Point` objects.
+
+        Args:
+            points: Points sharing the same dimension.
+
+        Returns:
+            A new :class:`PointArray` holding their coordinates.
+        """
+        if not points:
+            return cls(np.empty((0, 2)))
+        return cls([point.coordinates for point in points])
+
+    @property
+    def dimension(self) -> int:
+        """Number of coordinates per point."""
+        return self.coordinates.shape[1]
+
+    def to_points(self) -> List[Point]:
+        """Return the points as a list of :class:`~geo.point.Point` objects.
+
+        Returns:
+            One freshly allocated point per row.
+        """
+        return [Point(row) for row in self.coordinates.tolist()]
+
+    def squared_distances(self, index: int, candidates: np.ndarray) -> np.ndarray:
+        """Compute the squared Euclidean distances from one point to many.
+
+        Args:
+            index: Row of the reference point.
+            candidates: Integer array of rows to measure.
+
+        Returns:
+            ``float64`` array aligned with *candidates*.
+        """
+        return self.squared_distances_from(self.coordinates[index], candidates)
+
+    def squared_distances_from(
+        self, origin: np.ndarray, candidates: np.ndarray
+    ) -> np.ndarray:
+        """Compute the squared Euclidean distances from a position to many
+        points.
+
+        Coordinates are accumulated in axis order, exactly as
+        :meth:`~geo.point.Point.distance_to` does, so the values are
+        bit-for-bit identical to the square of that method's result before
+        its ``sqrt``.
+
+        Args:
+            origin: Reference position, one value per axis.
+            candidates: Integer array of rows to measure.
+
+        Returns:
+            ``float64`` array aligned with *candidates*.
+        """
+        block = self.coordinates[candidates]
+        diff = block[:, 0] - origin[0]
+        total = diff * diff
+        for axis in range(1, self.dimension):
+            diff = block[:, axis] - origin[axis]
+            total += diff * diff
+        return total
+
+    def within(
+        self, index: int, candidates: np.ndarray, r_squared: float
+    ) -> np.ndarray:
+        """Select the candidates lying within a squared radius of one point.
+
+        Args:
+            index: Row of the reference point.
+            candidates: Integer array of rows to test.
+            r_squared: Squared-distance threshold, normally obtained with
+                :func:`~geo.point.squared_radius` so that the result matches
+                ``distance_to(...) <= distance`` exactly.
+
+        Returns:
+            The subset of *candidates* whose squared distance is at most
+            *r_squared*, in the same order.
+        """
+        return candidates[self.squared_distances(index, candidates) <= r_squared]
+
+    def block_squared_distances(
+        self, rows_a: np.ndarray, rows_b: np.ndarray
+    ) -> np.ndarray:
+        """Compute the squared distances between two groups of points.
+
+        Accumulation follows the same axis order as :meth:`squared_distances`.
+
+        Args:
+            rows_a: Integer array of ``m`` rows.
+            rows_b: Integer array of ``p`` rows.
+
+        Returns:
+            ``(m, p)`` ``float64`` matrix of squared distances.
+        """
+        block_a = self.coordinates[rows_a]
+        block_b = self.coordinates[rows_b]
+        diff = block_a[:, None, 0] - block_b[None, :, 0]
+        total = diff * diff
+        for axis in range(1, self.dimension):
+            diff = block_a[:, None, axis] - block_b[None, :, axis]
+            total += diff * diff
+        return total
+
+    def paired_squared_distances(
+        self, rows_a: np.ndarray, rows_b: np.ndarray
+    ) -> np.ndarray:
+        """Compute the squared distance of each point of *rows_a* to the point
+        at the same position in *rows_b*.
+
+        Accumulation follows the same axis order as :meth:`squared_distances`.
+
+        Args:
+            rows_a: Integer array of ``m`` rows.
+            rows_b: Integer array of ``m`` rows.
+
+        Returns:
+            ``float64`` array of ``m`` squared distances.
+        """
+        coordinates = self.coordinates
+        diff = coordinates[rows_a, 0] - coordinates[rows_b, 0]
+        total = diff * diff
+        for axis in range(1, self.dimension):
+            diff = coordinates[rows_a, axis] - coordinates[rows_b, axis]
+            total += diff * diff
+        return total
+
+    def bounding_quadrant(self) -> Quadrant:
+        """Return the tightest axis-aligned bounding box of all points.
+
+        Returns:
+            A :class:`~geo.quadrant.Quadrant` (empty when there are no points).
+        """
+        if len(self) == 0:
+            return Quadrant.empty_quadrant(self.dimension)
+        return Quadrant(
+            self.coordinates.min(axis=0).tolist(),
+            self.coordinates.max(axis=0).tolist(),
+        )
+
+    def __len__(self) -> int:
+        return self.coordinates.shape[0]
+
+    def __getitem__(self, index: int) -> Point:
+        """Return point *index* as a standalone :class:`~geo.point.Point`."""
+        return Point(self.coordinates[index].tolist())
+
+    def __iter__(self) -> Iterator[Point]:
+        for row in self.coordinates.tolist():
+            yield Point(row)
+
+    def __repr__(self) -> str:
+        return f"PointArray(n={len(self)}, dimension={self.dimension})"
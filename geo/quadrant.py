@@ -7,6 +7,7 @@ and stroke sizes.
 
 from __future__ import annotations
 
+from math import sqrt
 from typing import List, Tuple
 
 
@@ -119,6 +120,31 @@ class Quadrant:
         self.min_coordinates = [c - distance for c in self.min_coordinates]
         self.max_coordinates = [c + distance for c in self.max_coordinates]
 
+    def distance_to(self, other: "Quadrant") -> float:
+        """Compute the smallest Euclidean distance between this quadrant and
+        *other*.
+
+        Pass ``point.bounding_quadrant()`` to measure the distance to a point.
+        Used to prune whole boxes in spatial-index queries.
+
+        Args:
+            other: Another :class:`Quadrant` in the same dimensional space.
+
+        Returns:
+            ``0.0`` when the quadrants overlap or touch, otherwise the length
+            of the shortest segment joining them.
+        """
+        total = 0.0
+        for lo1, hi1, lo2, hi2 in zip(
+            self.min_coordinates,
+            self.max_coordinates,
+            other.min_coordinates,
+            other.max_coordinates,
+        ):
+            gap = max(lo1 - hi2, lo2 - hi1, 0.0)
+            total += gap * gap
+        return sqrt(total)
+
     def get_arrays(self) -> Tuple[List[float], List[float]]:
         """Return the raw min and max coordinate arrays.
 
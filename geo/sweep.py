@@ -0,0 +1,88 @@
+"""
+Sort-and-sweep index for fixed-radius neighbour lookup.
+
+Points are sorted once along the X axis.  Two points within the query radius
+of each other differ by at most that radius in X, so the candidates of a point
+form one contiguous window of the sorted order, located with two binary
+searches.  This suits data spread thinly along one axis, where most grid
+cells would be empty.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from geo.point_array import PointArray
+
+if TYPE_CHECKING:
+    from geo.point import Point
+
+
+class SweepIndex:
+    """Point indices sorted by their X coordinate.
+
+    Examples:
+        List the candidates near point ``0``::
+
+            sweep = SweepIndex(points, 0.1)
+            for j in sweep.candidates(0):
+                ...
+    """
+
+    def __init__(
+        self,
+        points: Union[Sequence[Point], PointArray],
+        radius: float,
+    ) -> None:
+        """Sort the points by X.
+
+        Args:
+            points: Indexed point set (list of points or columnar store).
+            radius: Half-width of the X window returned for each query.
+        """
+        self.radius = radius
+        if isinstance(points, PointArray):
+            xs = points.coordinates[:, 0]
+            self.order: Union[List[int], np.ndarray] = np.argsort(xs, kind="stable")
+            self.sorted_xs: Union[List[float], np.ndarray] = xs[self.order]
+            self.x_of: Union[List[float], np.ndarray] = xs
+        else:
+            self.x_of = [point.coordinates[0] for point in points]
+            self.order = sorted(range(len(points)), key=self.x_of.__getitem__)
+            self.sorted_xs = [self.x_of[i] for i in self.order]
+
+    def window(self, x: float) -> Tuple[int, int]:
+        """Return the slice of the sorted order whose X lies within the radius.
+
+        Args:
+            x: Query X coordinate.
+
+        Returns:
+            ``(lo, hi)`` bounds into :attr:`order`.
+        """
+        xs = self.sorted_xs
+        if isinstance(xs, np.ndarray):
+            lo = np.searchsorted(xs, x - self.radius, "left")
+            hi = np.searchsorted(xs, x + self.radius, "right")
+            return int(lo), int(hi)
+        return bisect_left(xs, x - self.radius), bisect_right(xs, x + self.radius)
+
+    def candidates(self, index: int) -> Union[List[int], np.ndarray]:
+        """Return the indices of every point whose X is within the radius of
+        point *index* (the point itself included).
+
+        The result is a superset of the true neighbours: callers still have to
+        apply the distance test.  Indices refer to the original point order.
+
+        Args:
+            index: Index of the query point.
+
+        Returns:
+            Candidate indices — an index array for a columnar store, a list
+            otherwise.
+        """
+        lo, hi = self.window(self.x_of[index])
+        return self.order[lo:hi]
@@ -0,0 +1,295 @@
+"""
+Optional JIT-compiled backend for the hybrid Greedy + DFS traversal.
+
+The two phases of :func:`connectes.compute_cluster` only do integer and float
+work, which `Numba <https://numba.pydata.org>`_ compiles to machine code.  The
+kernels here run over flat arrays:
+
+* the coordinates, an ``(n, dimension)`` ``float64`` array;
+* a uniform grid index of cell side *distance* (the same as the ``grid``
+  engine): every point's linearised cell id, the sorted distinct cell ids,
+  and the point indices grouped by cell, so that the points of a cell are one
+  contiguous slice found by binary search;
+* the visited flags, labels and an ``int64`` stack preallocated to *n*.
+
+Compiled functions are cached on disk (``cache=True``): only the first run
+ever pays the compilation, and later processes load the machine code in a few
+milliseconds.  The cache lives in ``__pycache__`` next to this module, or
+under ``$NUMBA_CACHE_DIR`` when that is set (e.g. for a read-only install).
+
+When Numba is not installed, :data:`HAVE_NUMBA` is ``False`` and the entry
+points fall back to the pure-Python ``grid`` engine of :mod:`connectes`; the
+kernels stay importable as plain Python functions.  Results are identical
+either way: the distance test matches :meth:`~geo.point.Point.distance_to`.
+
+Usage::
+
+    python connectes.py --jit exemple_1.pts
+"""
+
+from itertools import product
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from connectes import DEFAULT_K, compute_component_labels
+from geo.point import Point, squared_radius
+from geo.point_array import PointArray
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for :func:`numba.njit` that leaves functions as they are."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+
+#: Largest linearised cell id; beyond it the grid index cannot be built and
+#: the pure-Python engine is used.
+_MAX_CELL_ID = 1 << 62
+
+
+@njit(cache=True)
+def _expand(
+    current,
+    coordinates,
+    r_squared,
+    cells,
+    keys,
+    starts,
+    order,
+    deltas,
+    visited,
+    labels,
+    label,
+    stack,
+    top,
+):
+    """Push the unvisited neighbours of *current*, marked and labelled, onto
+    *stack* above *top*; return the new top."""
+    dimension = coordinates.shape[1]
+    cell = cells[current]
+    for delta in deltas:
+        target = cell + delta
+        slot = np.searchsorted(keys, target)
+        if slot == len(keys) or keys[slot] != target:
+            continue
+        for position in range(starts[slot], starts[slot + 1]):
+            other = order[position]
+            if visited[other]:
+                continue
+            total = 0.0
+            for axis in range(dimension):
+                diff = coordinates[current, axis] - coordinates[other, axis]
+                total += diff * diff
+            if total <= r_squared:
+                visited[other] = True
+                labels[other] = label
+                stack[top] = other
+                top += 1
+    return top
+
+
+@njit(cache=True)
+def label_components(coordinates, r_squared, k, cells, keys, starts, order, deltas):
+    """Label every point with its component, seeds in index order.
+
+    Each component runs the greedy phase while it has at most *k* nodes, then
+    the counting phase; compiled, both cost the same per node, so *k* only
+    matters for parity with :func:`connectes.compute_cluster`.
+
+    Args:
+        coordinates: ``(n, dimension)`` ``float64`` coordinates.
+        r_squared: Squared threshold (see :func:`~geo.point.squared_radius`).
+        k: Greedy-phase threshold.
+        cells: Linearised cell id of every point.
+        keys: Sorted distinct cell ids.
+        starts: ``order[starts[c]:starts[c + 1]]`` are the points of
+            ``keys[c]``.
+        order: Point indices grouped by cell.
+        deltas: Id offsets of a cell's neighbourhood (itself included).
+
+    Returns:
+        ``(labels, count)``: an ``int32`` label per point, numbered in order
+        of each component's lowest index, and the number of components.
+    """
+    n = coordinates.shape[0]
+    visited = np.zeros(n, dtype=np.bool_)
+    labels = np.full(n, -1, dtype=np.int32)
+    stack = np.empty(n, dtype=np.int64)
+    count = 0
+    for seed in range(n):
+        if visited[seed]:
+            continue
+        visited[seed] = True
+        labels[seed] = count
+        stack[0] = seed
+        top = 1
+        size = 1
+
+        # Phase 1: greedy expansion, whole neighbour batches at a time.
+        while top > 0 and size <= k:
+            top -= 1
+            pushed = _expand(
+                stack[top],
+                coordinates,
+                r_squared,
+                cells,
+                keys,
+                starts,
+                order,
+                deltas,
+                visited,
+                labels,
+                count,
+                stack,
+                top,
+            )
+            size += pushed - top
+            top = pushed
+
+        # Phase 2: counting DFS until the stack drains.
+        while top > 0:
+            top -= 1
+            top = _expand(
+                stack[top],
+                coordinates,
+                r_squared,
+                cells,
+                keys,
+                starts,
+                order,
+                deltas,
+                visited,
+                labels,
+                count,
+                stack,
+                top,
+            )
+        count += 1
+    return labels, count
+
+
+def build_cell_index(
+    coordinates: np.ndarray, cell_size: float
+) -> Optional[Tuple[np.ndarray, ...]]:
+    """Build the flat grid index consumed by :func:`label_components`.
+
+    Cell coordinates are shifted to start at 1 and linearised with one spare
+    cell on each side, so a neighbour's id is the point's id plus a constant
+    offset.
+
+    Args:
+        coordinates: ``(n, dimension)`` ``float64`` coordinates.
+        cell_size: Cell side.
+
+    Returns:
+        ``(cells, keys, starts, order, deltas)``, or ``None`` when the
+        linearised ids would overflow (a threshold tiny against the spread).
+    """
+    n, dimension = coordinates.shape
+    grid = np.floor((coordinates - coordinates.min(axis=0)) / cell_size)
+    extents = [int(value) + 3 for value in grid.max(axis=0)]
+    strides = []
+    total = 1
+    for extent in reversed(extents):
+        strides.append(total)
+        total *= extent
+    if total > _MAX_CELL_ID:
+        return None
+    strides = np.array(strides[::-1], dtype=np.int64)
+
+    cells = (grid.astype(np.int64) + 1) @ strides
+    order = np.argsort(cells, kind="stable")
+    keys, first = np.unique(cells[order], return_index=True)
+    starts = np.append(first, n).astype(np.int64)
+    offsets = np.array(list(product((-1, 0, 1), repeat=dimension)), dtype=np.int64)
+    deltas = offsets @ strides
+    return cells, keys, starts, order.astype(np.int64), deltas
+
+
+def compute_component_labels_jit(
+    distance: float,
+    points: Union[List[Point], PointArray],
+    k: Union[int, str] = DEFAULT_K,
+) -> np.ndarray:
+    """Label every point with its connected component using the JIT kernels.
+
+    Falls back to :func:`connectes.compute_component_labels` with the
+    ``grid`` engine when Numba is missing or the grid index cannot be built;
+    the labels are the same.
+
+    Args:
+        distance: Maximum Euclidean distance that connects two points.
+        points: Complete list of points in the dataset, or their columnar
+            store.
+        k: Greedy-phase threshold; ``"auto"`` keeps
+            :data:`~connectes.DEFAULT_K`, since the compiled phases cost the
+            same.
+
+    Returns:
+        ``int32`` array with one label per point, components numbered in order
+        of their lowest point index.
+    """
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    coordinates = np.ascontiguousarray(points.coordinates, dtype=np.float64)
+    if len(coordinates) == 0:
+        return np.full(0, -1, dtype=np.int32)
+
+    index = None
+    if HAVE_NUMBA:
+        # Same cell side and rounding allowance as the grid engine.
+        cell_size = distance * (1 + 1e-9) if distance > 0 else 1.0
+        index = build_cell_index(coordinates, cell_size)
+    if index is None:
+        return compute_component_labels(distance, points, engine="grid", k=k)
+
+    threshold = DEFAULT_K if k == "auto" else int(k)
+    labels, _ = label_components(
+        coordinates, squared_radius(distance), threshold, *index
+    )
+    return labels
+
+
+def compute_component_sizes_jit(
+    distance: float,
+    points: Union[List[Point], PointArray],
+    k: Union[int, str] = DEFAULT_K,
+    verbose: bool = True,
+) -> List[int]:
+    """Compute connected-component sizes using the JIT kernels.
+
+    Args:
+        distance: Maximum Euclidean distance that connects two points.
+        points: Complete list of points in the dataset, or their columnar
+            store.
+        k: Greedy-phase threshold (see :func:`compute_component_labels_jit`).
+        verbose: When ``True``, print the sorted sizes to stdout in the form
+            ``[size1, size2, ...]``.
+
+    Returns:
+        Component sizes sorted in descending order.
+    """
+    labels = compute_component_labels_jit(distance, points, k)
+    sizes: List[int] = []
+    if len(labels):
+        counts = np.bincount(labels)
+        sizes = sorted(counts[counts > 0].tolist(), reverse=True)
+
+    if verbose:
+        print("[" + ", ".join(map(str, sizes)) + "]")
+
+    return sizes
+
+
+def warm_up() -> None:
+    """Compile the kernels (or load them from the disk cache) on a tiny
+    input, so that the first real call is not slowed down."""
+    compute_component_sizes_jit(1.0, PointArray(np.zeros((2, 2))), verbose=False)
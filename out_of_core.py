@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Out-of-core connected-component sizes for point sets larger than memory.
+
+The dataset is never loaded as a whole.  Every step streams it in blocks or
+works on one spatial tile at a time:
+
+1. **Scan** — one pass computes the point count and the bounding box, and a
+   second pass a coarse occupancy histogram.
+2. **Layout** — the bounding box is cut into a grid of tiles (slabs halved
+   along the longest side, never thinner than ``2 * distance``, as in
+   :mod:`parallel_connectes`) until, as counted on the histogram, both the
+   fullest tile and the largest pair of adjacent tile borders fit the memory
+   budget.
+3. **Bucket** — a streaming pass appends every point to its tile's file in a
+   scratch directory, through write buffers capped at a quarter of the
+   budget.
+4. **Solve** — tiles are loaded one at a time and labelled with a
+   vectorized union-find over the pair blocks of
+   :func:`~union_find.close_pair_blocks`.  A component that has no point
+   within *distance* of an interior cut is complete, so only its size is
+   kept (in a size multiset).  The points of every other component — the
+   border points, within *distance* of a cut — go to the tile's border file
+   together with a global id for their component.
+5. **Merge** — every edge between two tiles joins border points of adjacent
+   tiles.  Each tile's border file is therefore read together with those of
+   its forward neighbours only, and the cross-tile pairs feed a union-find
+   over the border components, whose merged sizes complete the result.
+
+Peak memory is one tile, or two tile borders during the merge (plus a forest
+node per component touching a cut), bounded by the budget through
+:data:`BYTES_PER_POINT` and :data:`BYTES_PER_AXIS`.  The sizes are identical
+to the in-memory solvers.
+
+Usage::
+
+    python out_of_core.py huge.pts --memory-budget 512M
+"""
+
+import argparse
+import os
+import tempfile
+from collections import Counter
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_connectes import parse_bytes
+from geo.point_array import PointArray
+from geo.quadrant import Quadrant
+from parallel_connectes import tile_slabs
+from pts_io import (
+    DEFAULT_BLOCK_ROWS,
+    DEFAULT_CHUNK_BYTES,
+    is_ptb,
+    iter_blocks,
+    open_ptb,
+    read_header,
+)
+from union_find import UnionFind, close_pair_blocks, component_labels_from_pairs
+
+#: Peak bytes per 2-D point while a tile is solved or two tile borders are
+#: merged (``float64`` rows and their copies, cell keys, sort orders, forest
+#: and one block of candidate pairs): at most 140 measured with
+#: :mod:`tracemalloc` on uniform and dense data, plus headroom.
+BYTES_PER_POINT = 160
+
+#: Extra peak bytes per point for every axis beyond two (about 45 measured).
+BYTES_PER_AXIS = 48
+
+#: Default memory budget.
+DEFAULT_MEMORY_BUDGET = 1 << 30
+
+#: The occupancy histogram has about ``2**_HISTOGRAM_BITS`` cells, spread
+#: evenly over the axes.
+_HISTOGRAM_BITS = 16
+
+# Same safety margin on the border width as parallel_connectes.
+_MARGIN = 1 + 1e-9
+
+
+def iter_dataset(
+    filename: str,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Iterator[np.ndarray]:
+    """Stream the points of a ``.pts`` or ``.ptb`` file in ``float64`` blocks.
+
+    Args:
+        filename: Dataset path.
+        block_rows: Rows per block.
+        chunk_bytes: Text bytes parsed at once (``.pts`` only).
+
+    Yields:
+        ``(m, dimension)`` arrays, in file order.
+    """
+    if not is_ptb(filename):
+        yield from iter_blocks(filename, block_rows, chunk_bytes)
+        return
+    _, coordinates = open_ptb(filename)
+    for start in range(0, len(coordinates), block_rows):
+        yield np.asarray(coordinates[start : start + block_rows], dtype=np.float64)
+
+
+def dataset_header(filename: str) -> Tuple[float, int]:
+    """Return ``(distance, dimension)`` of a ``.pts`` or ``.ptb`` file."""
+    if is_ptb(filename):
+        distance, coordinates = open_ptb(filename)
+        return distance, coordinates.shape[1]
+    return read_header(filename)
+
+
+def _layout_loads(
+    histogram: np.ndarray,
+    parts: Sequence[int],
+    extents: Sequence[float],
+    distance: float,
+) -> Tuple[int, int]:
+    """Count the fullest tile and the fullest border merge of a tile grid.
+
+    A histogram cell counts towards a tile's border when it may hold a point
+    within *distance* of one of the tile's interior cuts, so the border counts
+    are upper bounds.
+
+    Returns:
+        ``(tile, merge)``: the most points in one tile, and the most border
+        points of a tile and one of its neighbours together.
+    """
+    dimension = histogram.ndim
+    resolution = histogram.shape[0]
+    shape = [n for p in parts for n in (p, resolution // p)]
+    inner = tuple(range(1, 2 * dimension, 2))
+    tiles = histogram.reshape(shape).sum(axis=inner)
+
+    near = np.zeros(histogram.shape, dtype=bool)
+    cell = np.arange(resolution)
+    for axis, slab_count in enumerate(parts):
+        if slab_count == 1:
+            continue
+        per_slab = resolution // slab_count
+        cell_width = extents[axis] / resolution
+        if cell_width > 0:
+            reach = int(distance * _MARGIN / cell_width) + 1
+        else:
+            reach = per_slab
+        position = cell % per_slab
+        axis_near = ((position < reach) & (cell >= per_slab)) | (
+            (position >= per_slab - reach) & (cell < resolution - per_slab)
+        )
+        near |= axis_near.reshape([-1 if a == axis else 1 for a in range(dimension)])
+    borders = np.where(near, histogram, 0).reshape(shape).sum(axis=inner)
+
+    merge = 0
+    for offset in product((-1, 0, 1), repeat=dimension):
+        if offset <= (0,) * dimension:
+            continue
+        own = tuple(slice(max(0, -o), p - max(0, o)) for o, p in zip(offset, parts))
+        other = tuple(slice(max(0, o), p + min(0, o)) for o, p in zip(offset, parts))
+        pairs = borders[own] + borders[other]
+        if pairs.size:
+            merge = max(merge, int(pairs.max()))
+    return int(tiles.max()), merge
+
+
+def choose_parts(
+    histogram: np.ndarray,
+    extents: Sequence[float],
+    distance: float,
+    capacity: int,
+) -> List[int]:
+    """Choose the tile grid from an occupancy histogram.
+
+    Slabs are halved along the axis with the widest slab until the fullest
+    tile, and the border points of the fullest pair of adjacent tiles (which
+    the merge loads together), are both at most *capacity* points.
+
+    Args:
+        histogram: Point counts on a ``R^dimension`` grid over the bounding
+            box, ``R`` a power of two.
+        extents: Bounding-box side per axis.
+        distance: Connection threshold; slabs never get thinner than twice
+            this.
+        capacity: Points that fit in memory at once.
+
+    Returns:
+        Number of slabs per axis (powers of two).
+
+    Raises:
+        MemoryError: If no allowed layout brings every tile and border pair
+            under *capacity*, e.g. for a very dense cluster.
+    """
+    dimension = histogram.ndim
+    resolution = histogram.shape[0]
+    parts = [1] * dimension
+    while True:
+        fullest, merge = _layout_loads(histogram, parts, extents, distance)
+        if max(fullest, merge) <= capacity:
+            return parts
+
+        splittable = [
+            axis
+            for axis in range(dimension)
+            if parts[axis] < resolution
+            and extents[axis] / (parts[axis] * 2) >= 2 * distance
+        ]
+        if not splittable:
+            raise MemoryError(
+                f"A tile of {fullest} points (border merge of {merge}) does not "
+                f"fit the memory budget ({capacity} points) and cannot be split "
+                "further."
+            )
+        axis = max(splittable, key=lambda a: extents[a] / parts[a])
+        parts[axis] *= 2
+
+
+def _scan(
+    filename: str, block_rows: int, chunk_bytes: int
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Stream the file once for its point count and bounding box."""
+    count = 0
+    low = high = None
+    for block in iter_dataset(filename, block_rows, chunk_bytes):
+        count += len(block)
+        block_low, block_high = block.min(axis=0), block.max(axis=0)
+        low = block_low if low is None else np.minimum(low, block_low)
+        high = block_high if high is None else np.maximum(high, block_high)
+    return count, low, high
+
+
+def _histogram(
+    filename: str,
+    low: np.ndarray,
+    high: np.ndarray,
+    resolution: int,
+    block_rows: int,
+    chunk_bytes: int,
+) -> np.ndarray:
+    """Stream the file once more and count its points per histogram cell."""
+    dimension = len(low)
+    span = np.where(high > low, high - low, 1.0)
+    histogram = np.zeros((resolution,) * dimension, dtype=np.int64)
+    for block in iter_dataset(filename, block_rows, chunk_bytes):
+        cells = np.floor((block - low) / span * resolution).astype(np.intp)
+        np.clip(cells, 0, resolution - 1, out=cells)
+        flat = np.ravel_multi_index(tuple(cells.T), histogram.shape)
+        histogram += np.bincount(flat, minlength=histogram.size).reshape(
+            histogram.shape
+        )
+    return histogram
+
+
+class _TileWriter:
+    """Append rows to per-tile files through a bounded in-memory buffer."""
+
+    def __init__(self, directory: str, buffer_bytes: int) -> None:
+        self.directory = directory
+        self.buffer_bytes = buffer_bytes
+        self._pending: Dict[int, List[np.ndarray]] = {}
+        self._buffered = 0
+
+    def path(self, tile: int) -> str:
+        """Return the file holding the points of *tile*."""
+        return os.path.join(self.directory, f"tile_{tile}.f8")
+
+    def add(self, tile: int, rows: np.ndarray) -> None:
+        """Queue *rows* for *tile*, flushing everything past the buffer cap."""
+        self._pending.setdefault(tile, []).append(rows)
+        self._buffered += rows.nbytes
+        if self._buffered > self.buffer_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued row to its tile file."""
+        for tile, chunks in self._pending.items():
+            with open(self.path(tile), "ab") as handle:
+                for rows in chunks:
+                    np.ascontiguousarray(rows).tofile(handle)
+        self._pending.clear()
+        self._buffered = 0
+
+
+def compute_component_sizes_out_of_core(
+    filename: str,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    scratch_dir: Optional[str] = None,
+) -> List[int]:
+    """Compute the component sizes of a dataset file within a memory budget.
+
+    Args:
+        filename: ``.pts`` or ``.ptb`` dataset path.
+        memory_budget: Approximate cap on the memory used, in bytes.
+        scratch_dir: Parent directory of the temporary tile files (default:
+            the system temporary directory).  The files are removed at the
+            end.
+
+    Returns:
+        Component sizes sorted in descending order.
+
+    Raises:
+        MemoryError: If the densest region cannot be tiled within the
+            budget (see :func:`choose_parts`).
+    """
+    distance, dimension = dataset_header(filename)
+    per_point = BYTES_PER_POINT + BYTES_PER_AXIS * max(0, dimension - 2)
+    capacity = max(1, memory_budget // per_point)
+    # One block of candidate pairs costs about as much as this many points.
+    block_pairs = max(1, capacity // 2)
+    # Streaming buffers: the text chunk, its parsed copy and one block each
+    # take a small fraction of the budget.
+    block_rows = max(1, min(DEFAULT_BLOCK_ROWS, capacity // 8))
+    chunk_bytes = max(1 << 16, min(DEFAULT_CHUNK_BYTES, memory_budget // 16))
+
+    count, low, high = _scan(filename, block_rows, chunk_bytes)
+    if count == 0:
+        return []
+    resolution = 1 << max(1, _HISTOGRAM_BITS // dimension)
+    histogram = _histogram(filename, low, high, resolution, block_rows, chunk_bytes)
+    parts = choose_parts(histogram, (high - low).tolist(), distance, capacity)
+    del histogram
+    quadrant = Quadrant(low.tolist(), high.tolist())
+
+    with tempfile.TemporaryDirectory(prefix="connectes_", dir=scratch_dir) as scratch:
+        # --- Bucket the points into tile files ---
+        writer = _TileWriter(scratch, memory_budget // 4)
+        for block in iter_dataset(filename, block_rows, chunk_bytes):
+            slabs, _ = tile_slabs(block, quadrant, parts)
+            tiles = np.ravel_multi_index(tuple(slabs.T), parts)
+            order = np.argsort(tiles, kind="stable")
+            present, starts = np.unique(tiles[order], return_index=True)
+            bounds = np.append(starts, len(block))
+            for tile, lo, hi in zip(present.tolist(), bounds[:-1], bounds[1:]):
+                writer.add(tile, block[order[lo:hi]])
+        writer.flush()
+
+        # --- Solve tile by tile; keep border components for the merge ---
+        sizes: Counter = Counter()
+        border_sizes: List[int] = []
+        for tile in range(int(np.prod(parts))):
+            path = writer.path(tile)
+            if not os.path.exists(path):
+                continue
+            coordinates = np.fromfile(path, dtype=np.float64).reshape(-1, dimension)
+            os.remove(path)
+            labels = component_labels_from_pairs(
+                len(coordinates),
+                close_pair_blocks(distance, PointArray(coordinates), block_pairs),
+            )
+            populations = np.bincount(labels)
+
+            _, scaled = tile_slabs(coordinates, quadrant, parts)
+            border = np.zeros(len(coordinates), dtype=bool)
+            for axis, slab_count in enumerate(parts):
+                if slab_count == 1:
+                    continue
+                width = (high[axis] - low[axis]) / slab_count
+                reach = distance * _MARGIN / width + 1e-9
+                nearest_cut = np.clip(np.rint(scaled[:, axis]), 1, slab_count - 1)
+                border |= np.abs(scaled[:, axis] - nearest_cut) <= reach
+
+            touching = np.zeros(len(populations), dtype=bool)
+            touching[labels[border]] = True
+            for size in populations[~touching].tolist():
+                sizes[size] += 1
+
+            # Global ids for this tile's border components, in label order.
+            global_ids = np.full(len(populations), -1, dtype=np.int64)
+            global_ids[touching] = np.arange(
+                len(border_sizes), len(border_sizes) + int(touching.sum())
+            )
+            border_sizes.extend(populations[touching].tolist())
+            record = np.column_stack(
+                (coordinates[border], global_ids[labels[border]].astype(np.float64))
+            )
+            record.tofile(os.path.join(scratch, f"border_{tile}.f8"))
+            # Free this tile before the next one is loaded.
+            del coordinates, labels, scaled, border, record
+
+        # --- Merge the border components of adjacent tiles ---
+        forest = UnionFind(len(border_sizes))
+        union = forest.union
+        forward = [
+            offset
+            for offset in product((-1, 0, 1), repeat=dimension)
+            if offset > (0,) * dimension
+        ]
+
+        def load_border(slab: Sequence[int]) -> Optional[np.ndarray]:
+            """Read the border rows of the tile at *slab*, if there are any."""
+            if any(not 0 <= s < p for s, p in zip(slab, parts)):
+                return None
+            tile = int(np.ravel_multi_index(tuple(slab), parts))
+            path = os.path.join(scratch, f"border_{tile}.f8")
+            if not os.path.exists(path):
+                return None
+            return np.fromfile(path, dtype=np.float64).reshape(-1, dimension + 1)
+
+        for slab in product(*(range(p) for p in parts)):
+            own = load_border(slab)
+            if own is None or not len(own):
+                continue
+            for offset in forward:
+                other = load_border([s + o for s, o in zip(slab, offset)])
+                if other is None or not len(other):
+                    continue
+                rows = np.concatenate((own, other))
+                ids = rows[:, dimension].astype(np.int64)
+                points = PointArray(rows[:, :dimension])
+                del rows, other
+                for left, right in close_pair_blocks(distance, points, block_pairs):
+                    # Pairs within one tile are already merged: keep cross pairs.
+                    cross = (left < len(own)) != (right < len(own))
+                    joined = np.unique(
+                        np.column_stack((ids[left[cross]], ids[right[cross]])), axis=0
+                    )
+                    for i, j in joined.tolist():
+                        union(i, j)
+
+    if border_sizes:
+        roots = np.fromiter(
+            (forest.find(i) for i in range(len(border_sizes))),
+            dtype=np.intp,
+            count=len(border_sizes),
+        )
+        merged = np.bincount(roots, weights=border_sizes)
+        for size in merged[merged > 0].astype(np.int64).tolist():
+            sizes[size] += 1
+
+    result: List[int] = []
+    for value, number in sorted(sizes.items(), reverse=True):
+        result.extend([value] * number)
+    return result
+
+
+def main() -> None:
+    """Entry point: process ``.pts``/``.ptb`` files within a memory budget."""
+    parser = argparse.ArgumentParser(
+        description="Print connected-component sizes of files larger than memory."
+    )
+    parser.add_argument("instances", nargs="*", help=".pts or .ptb files to process")
+    parser.add_argument(
+        "--memory-budget",
+        type=parse_bytes,
+        default=DEFAULT_MEMORY_BUDGET,
+        metavar="SIZE",
+        help="approximate memory cap, e.g. 512M (default: 1G)",
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        help="where to put the temporary tile files (default: system temp dir)",
+    )
+    args = parser.parse_args()
+
+    if not args.instances:
+        parser.print_usage()
+        return
+
+    for filename in args.instances:
+        try:
+            sizes = compute_component_sizes_out_of_core(
+                filename, args.memory_budget, args.scratch_dir
+            )
+            print(f"# {filename} ({sum(sizes)} points)")
+            print("[" + ", ".join(map(str, sizes)) + "]")
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+
+
+if __name__ == "__main__":
+    main()
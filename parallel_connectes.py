@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Multi-process connected-component sizes via tile decomposition.
+
+Dispatching *seeds* to several processes is unsound — workers race to claim
+the same neighbours.  Dispatching *space* is not: the bounding box of the
+point set (a :class:`~geo.quadrant.Quadrant`) is cut into a regular grid of
+tiles, every tile is solved independently in a worker process, and the
+partial components are then stitched together:
+
+1. Each worker labels the points of its tile with a local union-find and
+   returns, for every point, the tile-local index of its component root.
+2. The parent process replays those labels into one global
+   :class:`~union_find.UnionFind`.
+3. Any edge joining two tiles has both endpoints within *distance* of a tile
+   border, so a final union-find pass over the border points alone merges
+   every component that straddles a cut.
+
+The resulting sizes are identical to those of the sequential traversal.
+"""
+
+from multiprocessing import Pool
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from geo.point import Point
+from geo.point_array import PointArray
+from geo.quadrant import Quadrant
+from union_find import UnionFind, close_pairs
+
+# Safety margin on the border width, matching the grid engines.
+_MARGIN = 1 + 1e-9
+
+
+def tile_layout(quadrant: Quadrant, distance: float, tiles: int) -> List[int]:
+    """Choose how many slabs to cut along each axis of *quadrant*.
+
+    The longest remaining slab side is halved until at least *tiles* tiles
+    exist, without ever making a slab thinner than ``2 * distance`` (thinner
+    tiles would consist almost entirely of border points).
+
+    Args:
+        quadrant: Bounding box of the point set.
+        distance: Connection threshold.
+        tiles: Desired number of tiles.
+
+    Returns:
+        Number of slabs per axis; their product is the tile count.
+    """
+    dimension = len(quadrant.min_coordinates)
+    extents = [hi - lo for lo, hi in (quadrant.limits(a) for a in range(dimension))]
+    parts = [1] * dimension
+
+    while np.prod(parts) < tiles:
+        axis = max(range(dimension), key=lambda a: extents[a] / parts[a])
+        half = extents[axis] / (parts[axis] * 2)
+        if half == 0 or half < 2 * distance:
+            break
+        parts[axis] *= 2
+
+    return parts
+
+
+def tile_slabs(
+    coordinates: np.ndarray, quadrant: Quadrant, parts: Sequence[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Locate every point in the tile grid.
+
+    Args:
+        coordinates: ``(n, dimension)`` coordinate array.
+        quadrant: Bounding box being tiled.
+        parts: Slab count per axis (see :func:`tile_layout`).
+
+    Returns:
+        ``(slabs, scaled)`` where *slabs* holds each point's integer slab
+        index per axis and *scaled* its position in slab-width units.
+    """
+    low = np.asarray(quadrant.min_coordinates)
+    high = np.asarray(quadrant.max_coordinates)
+    parts_arr = np.asarray(parts)
+    width = np.where(parts_arr > 1, (high - low) / parts_arr, 1.0)
+    scaled = (coordinates - low) / width
+    slabs = np.clip(np.floor(scaled).astype(np.intp), 0, parts_arr - 1)
+    return slabs, scaled
+
+
+def _solve_tile(task: Tuple[float, np.ndarray]) -> np.ndarray:
+    """Worker entry point: label the points of one tile.
+
+    Args:
+        task: ``(distance, coordinates)`` for the tile's points.
+
+    Returns:
+        ``int32`` array giving, for each tile point, the tile-local index of
+        the root of its component.
+    """
+    distance, coordinates = task
+    forest = UnionFind(len(coordinates))
+    for i, j in close_pairs(distance, PointArray(coordinates)):
+        forest.union(i, j)
+    return np.fromiter(
+        (forest.find(i) for i in range(len(coordinates))),
+        dtype=np.int32,
+        count=len(coordinates),
+    )
+
+
+def compute_component_sizes_parallel(
+    distance: float,
+    points: Union[List[Point], PointArray],
+    workers: int,
+    tiles: int = 0,
+) -> List[int]:
+    """Compute connected-component sizes with *workers* processes.
+
+    Args:
+        distance: Maximum Euclidean distance that connects two points.
+        points: Complete list of points in the dataset, or their columnar
+            store.
+        workers: Number of worker processes.
+        tiles: Target number of tiles; defaults to ``4 * workers`` so that
+            uneven tiles still balance across the pool.
+
+    Returns:
+        Component sizes sorted in descending order.
+    """
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    n = len(points)
+    if n == 0:
+        return []
+
+    coordinates = points.coordinates
+    quadrant = points.bounding_quadrant()
+    parts = tile_layout(quadrant, distance, tiles or 4 * workers)
+    slabs, scaled = tile_slabs(coordinates, quadrant, parts)
+    tile_ids = np.ravel_multi_index(tuple(slabs.T), parts)
+
+    # Group point rows by tile: sort once, then slice at each tile boundary.
+    order = np.argsort(tile_ids, kind="stable")
+    bounds = np.searchsorted(tile_ids[order], np.arange(int(np.prod(parts)) + 1))
+    members = [order[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    # --- Solve every tile independently ---
+    tasks = [(distance, coordinates[rows]) for rows in members]
+    with Pool(workers) as pool:
+        local_roots = pool.map(_solve_tile, tasks)
+
+    forest = UnionFind(n)
+    union = forest.union
+    for rows, roots in zip(members, local_roots):
+        rows = rows.tolist()
+        for local, root in enumerate(roots.tolist()):
+            if local != root:
+                union(rows[local], rows[root])
+
+    # --- Stitch components across tile borders ---
+    # A point is a border point when it lies within *distance* of an interior
+    # cut on some axis; every cross-tile edge joins two such points.  The test
+    # runs in slab units, like the tile assignment, plus a rounding allowance.
+    border = np.zeros(n, dtype=bool)
+    for axis, count in enumerate(parts):
+        if count == 1:
+            continue
+        low, high = quadrant.limits(axis)
+        reach = distance * _MARGIN / ((high - low) / count) + 1e-9
+        nearest_cut = np.clip(np.rint(scaled[:, axis]), 1, count - 1)
+        border |= np.abs(scaled[:, axis] - nearest_cut) <= reach
+
+    border_rows = np.flatnonzero(border)
+    border_points = PointArray(coordinates[border_rows])
+    border_rows = border_rows.tolist()
+    for i, j in close_pairs(distance, border_points):
+        union(border_rows[i], border_rows[j])
+
+    return forest.component_sizes()
@@ -0,0 +1,232 @@
+"""
+Opt-in instrumentation of the connected-component pipeline.
+
+Profiling is off unless a :func:`profile` block is active.  Inside one, the
+instrumented functions of :mod:`connectes` record into the block's
+:class:`RunStats`:
+
+* wall time per phase — ``load`` (:func:`connectes.load_instance`),
+  ``index`` (neighbour engine build), ``tune`` (``k="auto"``), ``traversal``
+  and ``sort`` (:func:`connectes.print_components_sizes`);
+* the number of distance evaluations, and the nodes expanded by the greedy
+  and by the DFS phase of :func:`connectes.compute_cluster`;
+* the deepest traversal stack and the peak resident memory of the block (or,
+  unless the block resets the process's peak, its growth).
+
+When profiling is off, the hot path pays one global lookup per
+:func:`~connectes.compute_cluster` call; the per-node loops are untouched
+(counting versions of them are only built while a block is active).  The
+other solvers (``--frontier``, ``--jit``, ``--workers``) only report phase
+times.
+
+Examples:
+    Profile one run and print the report::
+
+        with profile() as stats:
+            distance, points = load_instance("big.pts")
+            print_components_sizes(distance, points, engine="grid")
+        print(stats.report())
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+#: Writing ``5`` here resets the process's peak RSS (Linux 4.0+).
+_CLEAR_REFS = "/proc/self/clear_refs"
+_STATUS = "/proc/self/status"
+
+#: Stats of the innermost active :func:`profile` block, if any.
+_active: Optional["RunStats"] = None
+
+
+class RunStats:
+    """Counters and timings collected during a :func:`profile` block.
+
+    Attributes:
+        phases: Wall-clock seconds per phase name, in first-seen order.
+        distance_evaluations: Point pairs whose distance was computed.
+        greedy_nodes: Nodes expanded in the greedy phase.
+        dfs_nodes: Nodes expanded in the counting DFS phase.
+        components: Components found by :func:`connectes.compute_cluster`.
+        max_stack_depth: Deepest traversal stack seen.
+        peak_rss_bytes: Peak resident memory during the block, when the block
+            was opened with ``reset_peak=True`` and the kernel supports the
+            reset (``None`` otherwise).
+        peak_rss_growth_bytes: Otherwise, how much the block raised the
+            process's lifetime peak (``0`` after a larger earlier run;
+            ``None`` without :mod:`resource`).
+    """
+
+    def __init__(self) -> None:
+        """Create empty stats."""
+        self.phases: Dict[str, float] = {}
+        self.distance_evaluations = 0
+        self.greedy_nodes = 0
+        self.dfs_nodes = 0
+        self.components = 0
+        self.max_stack_depth = 0
+        self.peak_rss_bytes: Optional[int] = None
+        self.peak_rss_growth_bytes: Optional[int] = None
+        self._hwm_reset = False
+        self._lifetime_peak = 0
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Add *seconds* to the time of *phase*."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def track_depth(
+        self, expand: Callable[[int], List[int]], stack: Any
+    ) -> Callable[[int], List[int]]:
+        """Wrap an expansion step so that it records the stack depth.
+
+        Args:
+            expand: Expansion step of :func:`connectes.compute_cluster`.
+            stack: The traversal stack the found nodes are pushed onto.
+
+        Returns:
+            A callable with the same result as *expand*.
+        """
+
+        def tracked(current: int) -> List[int]:
+            found = expand(current)
+            depth = len(stack) + len(found)
+            if depth > self.max_stack_depth:
+                self.max_stack_depth = depth
+            return found
+
+        return tracked
+
+    def start(self, reset_peak: bool = False) -> None:
+        """Record the memory baseline of the run.
+
+        Args:
+            reset_peak: Also reset the kernel's peak-RSS mark, so that the
+                peak covers this run only.  The mark is process-wide: any
+                other ``ru_maxrss``/``VmHWM`` reader in the process sees the
+                reset too.
+        """
+        self._lifetime_peak = _lifetime_peak_rss() or 0
+        if not reset_peak:
+            return
+        try:
+            with open(_CLEAR_REFS, "w") as handle:
+                handle.write("5")
+            self._hwm_reset = True
+        except OSError:
+            self._hwm_reset = False
+
+    def finish(self) -> None:
+        """Record the peak resident memory of the run."""
+        if self._hwm_reset:
+            self.peak_rss_bytes = _status_bytes("VmHWM")
+            return
+        # The lifetime peak also drops with the reset, so it is only
+        # compared when the reset was not possible.
+        peak = _lifetime_peak_rss()
+        if peak is not None:
+            self.peak_rss_growth_bytes = max(0, peak - self._lifetime_peak)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the stats as a JSON-serialisable dictionary."""
+        return {
+            "phases_s": dict(self.phases),
+            "distance_evaluations": self.distance_evaluations,
+            "greedy_nodes": self.greedy_nodes,
+            "dfs_nodes": self.dfs_nodes,
+            "components": self.components,
+            "max_stack_depth": self.max_stack_depth,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "peak_rss_growth_bytes": self.peak_rss_growth_bytes,
+        }
+
+    def to_json(self) -> str:
+        """Return the stats as a JSON string."""
+        return json.dumps(self.to_dict())
+
+    def report(self) -> str:
+        """Return a human-readable report, one ``# ``-prefixed line per item."""
+        lines = [
+            f"# {phase + ' time':<22}{seconds * 1000:.2f} ms"
+            for phase, seconds in self.phases.items()
+        ]
+        lines.append(f"# distance evaluations  {self.distance_evaluations}")
+        lines.append(
+            f"# nodes expanded        greedy {self.greedy_nodes}, dfs {self.dfs_nodes}"
+        )
+        lines.append(f"# max stack depth       {self.max_stack_depth}")
+        if self.peak_rss_bytes is not None:
+            peak = self.peak_rss_bytes / 2**20
+            lines.append(f"# peak RSS of this run  {peak:.1f} MiB")
+        elif self.peak_rss_growth_bytes is not None:
+            growth = self.peak_rss_growth_bytes / 2**20
+            lines.append(f"# peak RSS growth       {growth:.1f} MiB")
+        return "\n".join(lines)
+
+
+def _status_bytes(field: str) -> Optional[int]:
+    """Read a ``kB`` field of ``/proc/self/status``, in bytes."""
+    try:
+        with open(_STATUS) as handle:
+            for line in handle:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _lifetime_peak_rss() -> Optional[int]:
+    """Return the peak resident memory since the process started, in bytes."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def active_stats() -> Optional[RunStats]:
+    """Return the stats of the active :func:`profile` block, or ``None``."""
+    return _active
+
+
+@contextmanager
+def profile(reset_peak: bool = False) -> Iterator[RunStats]:
+    """Collect :class:`RunStats` for the instrumented calls in the block.
+
+    Args:
+        reset_peak: Reset the process's peak-RSS mark when the block starts
+            (see :meth:`RunStats.start`); otherwise only the growth of the
+            lifetime peak is measured, without touching kernel state.
+
+    Yields:
+        The stats object, complete once the block exits.
+    """
+    global _active
+    previous = _active
+    stats = _active = RunStats()
+    stats.start(reset_peak)
+    try:
+        yield stats
+    finally:
+        stats.finish()
+        _active = previous
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Time the block as *phase* if profiling is active (a no-op otherwise)."""
+    stats = _active
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_time(phase, time.perf_counter() - start)
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Fast, streaming reader for ``.pts`` dataset files and their binary ``.ptb``
+companion format.
+
+The file is read in large binary chunks cut at line boundaries; each chunk is
+parsed in a single C-level call (:func:`numpy.fromstring`) instead of one
+``float()`` per coordinate and one :class:`~geo.point.Point` per line.  Two
+modes are offered:
+
+* :func:`load_coordinates` fills one preallocated ``(n, dimension)`` buffer,
+  so peak memory is the coordinates plus a single chunk.
+* :func:`iter_blocks` yields fixed-size blocks of rows, so files larger than
+  memory can be consumed incrementally.
+
+The ``.ptb`` format stores the same data without any parsing cost: a 32-byte
+little-endian header (see :data:`PTB_HEADER`) followed by the raw coordinate
+rows.  :func:`open_ptb` memory-maps it, so opening is O(1) whatever the size.
+
+Usage (convert a text file to binary)::
+
+    python pts_io.py exemple_4.pts exemple_4.ptb
+"""
+
+import struct
+import sys
+import warnings
+from typing import BinaryIO, Iterable, Iterator, Tuple
+
+import numpy as np
+
+#: Bytes read from disk per chunk.
+DEFAULT_CHUNK_BYTES = 1 << 24
+
+#: Rows per block yielded by :func:`iter_blocks`.
+DEFAULT_BLOCK_ROWS = 1 << 16
+
+#: ``.ptb`` header: magic, format version, dimension, point count, distance
+#: threshold and NumPy dtype string (e.g. ``b"<f8"``), padded to 32 bytes.
+PTB_HEADER = struct.Struct("<4sHHQd8s")
+PTB_MAGIC = b"PTB\x00"
+PTB_VERSION = 1
+
+
+def _iter_chunks(handle: BinaryIO, chunk_bytes: int) -> Iterator[bytes]:
+    """Yield successive runs of complete lines from an open binary file.
+
+    Args:
+        handle: File positioned at the start of the coordinate lines.
+        chunk_bytes: Approximate size of each run.
+
+    Yields:
+        Byte strings that never split a line.
+    """
+    carry = b""
+    while True:
+        data = handle.read(chunk_bytes)
+        if not data:
+            break
+        data = carry + data
+        cut = data.rfind(b"\n") + 1
+        carry = data[cut:]
+        if cut:
+            yield data[:cut]
+    if carry:
+        yield carry
+
+
+def _parse_rows(data: bytes, dimension: int) -> np.ndarray:
+    """Parse a run of ``x, y[, ...]`` lines into an ``(m, dimension)`` array.
+
+    Args:
+        data: Complete lines of comma-separated coordinates.
+        dimension: Number of coordinates per line.
+
+    Returns:
+        ``float64`` array with one row per non-blank line.
+
+    Raises:
+        ValueError: If a value cannot be parsed or the value count is not a
+            multiple of *dimension*.
+    """
+    if not data.strip():
+        # fromstring reports a spurious value for whitespace-only input
+        return np.empty((0, dimension))
+    with warnings.catch_warnings():
+        # Malformed input only triggers a DeprecationWarning and a truncated
+        # result; promote it to an error.
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(data.replace(b",", b" "), sep=" ")
+        except DeprecationWarning as error:
+            raise ValueError(f"Malformed coordinate data: {error}") from None
+    if values.size % dimension:
+        raise ValueError(
+            f"Found {values.size} values, not a multiple of dimension {dimension}."
+        )
+    return values.reshape(-1, dimension)
+
+
+def _read_preamble(handle: BinaryIO) -> Tuple[float, int]:
+    """Read the distance line and detect the dimension from the first point.
+
+    The handle is left positioned at the start of the coordinate lines.
+
+    Args:
+        handle: Binary file positioned at its start.
+
+    Returns:
+        ``(distance, dimension)``; the dimension defaults to ``2`` for a file
+        without points.
+    """
+    distance = float(handle.readline())
+    start = handle.tell()
+    dimension = 2
+    for line in handle:
+        if line.strip():
+            dimension = line.count(b",") + 1
+            break
+    handle.seek(start)
+    return distance, dimension
+
+
+def read_header(filename: str) -> Tuple[float, int]:
+    """Return the distance threshold and point dimension of a ``.pts`` file.
+
+    Args:
+        filename: Path to the ``.pts`` file.
+
+    Returns:
+        ``(distance, dimension)``.
+    """
+    with open(filename, "rb") as handle:
+        return _read_preamble(handle)
+
+
+def load_coordinates(
+    filename: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> Tuple[float, np.ndarray]:
+    """Load a whole ``.pts`` file into one coordinate array.
+
+    A first pass counts the lines (a C-level scan) so that the output buffer
+    can be allocated once at its final size; the second pass parses each
+    chunk straight into its slice of the buffer.  Binary ``.ptb`` files
+    (recognised by their magic bytes) are memory-mapped by :func:`open_ptb`
+    instead.
+
+    Args:
+        filename: Path to the ``.pts`` or ``.ptb`` file.
+        chunk_bytes: Bytes read per chunk.
+
+    Returns:
+        ``(distance, coordinates)`` where *coordinates* has shape
+        ``(n, dimension)``.
+    """
+    if is_ptb(filename):
+        return open_ptb(filename)
+
+    with open(filename, "rb") as handle:
+        distance, dimension = _read_preamble(handle)
+        start = handle.tell()
+
+        capacity = 1
+        for chunk in iter(lambda: handle.read(chunk_bytes), b""):
+            capacity += chunk.count(b"\n")
+        handle.seek(start)
+
+        buffer = np.empty((capacity, dimension))
+        filled = 0
+        for chunk in _iter_chunks(handle, chunk_bytes):
+            rows = _parse_rows(chunk, dimension)
+            buffer[filled : filled + len(rows)] = rows
+            filled += len(rows)
+
+    # Blank lines are counted but produce no row: trim the unused tail.
+    return distance, buffer[:filled]
+
+
+def iter_blocks(
+    filename: str,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Iterator[np.ndarray]:
+    """Stream the points of a ``.pts`` file in fixed-size blocks.
+
+    Use :func:`read_header` to obtain the distance threshold.
+
+    Args:
+        filename: Path to the ``.pts`` file.
+        block_rows: Rows per yielded block; only the last block may be shorter.
+        chunk_bytes: Bytes read per chunk.
+
+    Yields:
+        ``(block_rows, dimension)`` ``float64`` arrays, in file order.
+    """
+    with open(filename, "rb") as handle:
+        _, dimension = _read_preamble(handle)
+        block = np.empty((block_rows, dimension))
+        filled = 0
+        for chunk in _iter_chunks(handle, chunk_bytes):
+            rows = _parse_rows(chunk, dimension)
+            while len(rows):
+                take = min(block_rows - filled, len(rows))
+                block[filled : filled + take] = rows[:take]
+                filled += take
+                rows = rows[take:]
+                if filled == block_rows:
+                    yield block
+                    block = np.empty((block_rows, dimension))
+                    filled = 0
+        if filled:
+            yield block[:filled]
+
+
+def is_ptb(filename: str) -> bool:
+    """Tell whether a dataset file uses the binary ``.ptb`` format.
+
+    Args:
+        filename: Path to a dataset file.
+
+    Returns:
+        ``True`` if the file starts with :data:`PTB_MAGIC`.
+    """
+    with open(filename, "rb") as handle:
+        return handle.read(len(PTB_MAGIC)) == PTB_MAGIC
+
+
+def _pack_header(
+    distance: float, dimension: int, count: int, dtype: np.dtype
+) -> bytes:
+    """Encode a ``.ptb`` header.
+
+    Args:
+        distance: Distance threshold.
+        dimension: Coordinates per point.
+        count: Number of points.
+        dtype: Little-endian floating-point dtype of the coordinates.
+
+    Returns:
+        The :data:`PTB_HEADER`-sized byte string.
+
+    Raises:
+        ValueError: If *dtype* is not a little-endian float type.
+    """
+    if dtype.kind != "f" or dtype.byteorder == ">":
+        raise ValueError(f"Unsupported .ptb coordinate dtype {dtype}.")
+    code = dtype.newbyteorder("<").str.encode()
+    return PTB_HEADER.pack(PTB_MAGIC, PTB_VERSION, dimension, count, distance, code)
+
+
+def open_ptb(filename: str) -> Tuple[float, np.ndarray]:
+    """Memory-map a ``.ptb`` file without reading its coordinates.
+
+    Args:
+        filename: Path to the ``.ptb`` file.
+
+    Returns:
+        ``(distance, coordinates)`` where *coordinates* is a read-only
+        ``(n, dimension)`` :class:`numpy.memmap` over the file.
+
+    Raises:
+        ValueError: If the header is not a supported ``.ptb`` header.
+    """
+    with open(filename, "rb") as handle:
+        raw = handle.read(PTB_HEADER.size)
+    if len(raw) < PTB_HEADER.size:
+        raise ValueError(f"{filename}: truncated .ptb header.")
+    magic, version, dimension, count, distance, code = PTB_HEADER.unpack(raw)
+    if magic != PTB_MAGIC or version != PTB_VERSION:
+        raise ValueError(f"{filename}: not a version {PTB_VERSION} .ptb file.")
+
+    dtype = np.dtype(code.rstrip(b"\x00").decode())
+    if count == 0:
+        return distance, np.empty((0, dimension), dtype=dtype)
+    coordinates = np.memmap(
+        filename,
+        dtype=dtype,
+        mode="r",
+        offset=PTB_HEADER.size,
+        shape=(count, dimension),
+    )
+    return distance, coordinates
+
+
+def write_ptb_blocks(
+    filename: str,
+    distance: float,
+    dimension: int,
+    blocks: Iterable[np.ndarray],
+    dtype: str = "<f8",
+) -> int:
+    """Write a ``.ptb`` file from a stream of coordinate blocks.
+
+    Blocks are appended after a placeholder header, which is rewritten with
+    the final point count at the end, so memory use stays at one block
+    whatever the file size.
+
+    Args:
+        filename: Output path.
+        distance: Distance threshold stored in the header.
+        dimension: Coordinates per point.
+        blocks: ``(m, dimension)`` arrays, in output order.
+        dtype: Stored coordinate type.
+
+    Returns:
+        Number of points written.
+    """
+    stored = np.dtype(dtype)
+    count = 0
+    with open(filename, "wb") as handle:
+        handle.write(_pack_header(distance, dimension, 0, stored))
+        for block in blocks:
+            np.ascontiguousarray(block, dtype=stored).tofile(handle)
+            count += len(block)
+        handle.seek(0)
+        handle.write(_pack_header(distance, dimension, count, stored))
+    return count
+
+
+def convert_pts_to_ptb(source: str, destination: str, dtype: str = "<f8") -> int:
+    """Convert a text ``.pts`` file to ``.ptb`` in a single streaming pass.
+
+    Args:
+        source: Input ``.pts`` path.
+        destination: Output ``.ptb`` path.
+        dtype: Stored coordinate type.
+
+    Returns:
+        Number of points written.
+    """
+    distance, dimension = read_header(source)
+    return write_ptb_blocks(
+        destination, distance, dimension, iter_blocks(source), dtype
+    )
+
+
+def main() -> None:
+    """Entry point: convert ``<input.pts> <output.ptb>``."""
+    if len(sys.argv) != 3:
+        print("Usage: python pts_io.py <input.pts> <output.ptb>")
+        sys.exit(1)
+
+    count = convert_pts_to_ptb(sys.argv[1], sys.argv[2])
+    print(f"Converted: {sys.argv[1]} -> {sys.argv[2]} ({count} points)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+On-disk cache of connected-component results.
+
+Entries are keyed by a SHA-256 digest of the dataset file's content (which
+includes its distance threshold) combined with the algorithm parameters that
+produced the result, so any edit to the file or change of parameters is a
+miss.  Each entry is one small ``.npz`` file holding the descending size list
+and, optionally, the per-point labels.
+
+Digests of large files are memoised against their path, size, modification
+time and inode, so a hit on an unchanged file costs a ``stat`` and a small
+read rather than a full re-hash.  Each memo is its own small ``.digest`` file
+named after the path, written atomically like the entries, so concurrent runs
+never rewrite a shared file.
+
+The cache is size-capped with least-recently-used eviction: a hit refreshes
+the entry's (or memo's) modification time, and after every store the oldest
+files of both kinds are deleted until the total fits in
+:attr:`ResultCache.max_bytes`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+#: Default cap on the total size of the cached entries and digest memos.
+DEFAULT_MAX_BYTES = 256 << 20
+
+#: Bytes hashed per read.
+_HASH_CHUNK = 1 << 20
+
+#: Suffixes of the cache's files: result entries and file-digest memos.
+_SUFFIXES = (".npz", ".digest")
+
+
+def default_cache_dir() -> str:
+    """Return the cache directory: ``$CONNECTES_CACHE_DIR``, else
+    ``connectes`` under ``$XDG_CACHE_HOME`` (default ``~/.cache``)."""
+    explicit = os.environ.get("CONNECTES_CACHE_DIR")
+    if explicit:
+        return explicit
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "connectes")
+
+
+def file_digest(filename: str) -> str:
+    """Return the SHA-256 hex digest of a file's content.
+
+    Args:
+        filename: File to hash.
+
+    Returns:
+        64-character hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """A directory of cached component results with LRU eviction.
+
+    Examples:
+        Reuse a result across runs::
+
+            cache = ResultCache()
+            key = cache.key("big.pts", engine="grid", k=8)
+            hit = cache.get(key)
+            if hit is None:
+                sizes = print_components_sizes(distance, points, verbose=False)
+                cache.put(key, sizes)
+            else:
+                sizes, _ = hit
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Open (and create if needed) a cache directory.
+
+        Args:
+            directory: Cache location; defaults to :func:`default_cache_dir`.
+            max_bytes: Cap on the total size of the stored entries and
+                digest memos.
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Return the entry file of *key*."""
+        return os.path.join(self.directory, key + ".npz")
+
+    def digest(self, filename: str) -> str:
+        """Return the content digest of *filename*, memoised on its metadata.
+
+        Args:
+            filename: Dataset file.
+
+        Returns:
+            The :func:`file_digest` of the file.
+        """
+        info = os.stat(filename)
+        stamp = [info.st_size, info.st_mtime_ns, info.st_ino]
+        name = os.path.realpath(filename).encode()
+        memo_path = os.path.join(
+            self.directory, hashlib.sha256(name).hexdigest() + ".digest"
+        )
+        try:
+            with open(memo_path) as handle:
+                known: Dict[str, Any] = json.load(handle)
+            if known["stamp"] == stamp:
+                os.utime(memo_path)
+                return known["digest"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        digest = file_digest(filename)
+        memo = {"stamp": stamp, "digest": digest}
+        self._write_atomic(memo_path, json.dumps(memo).encode())
+        return digest
+
+    def key(self, filename: str, **params: Any) -> str:
+        """Build the cache key of a dataset file and algorithm parameters.
+
+        Args:
+            filename: Dataset file; its content (distance line included)
+                enters the key.
+            **params: JSON-serialisable parameters that affect the result,
+                such as ``engine`` and ``k``.
+
+        Returns:
+            Hexadecimal key.
+        """
+        material = json.dumps([self.digest(filename), params], sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[List[int], Optional[np.ndarray]]]:
+        """Look up an entry and mark it as recently used.
+
+        Args:
+            key: Key from :meth:`key`.
+
+        Returns:
+            ``(sizes, labels)`` — *labels* is ``None`` when none were stored —
+            or ``None`` on a miss.  Unreadable entries are deleted and
+            reported as misses.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                sizes = entry["sizes"].tolist()
+                labels = entry["labels"] if "labels" in entry.files else None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            self._discard(path)
+            return None
+        os.utime(path)
+        return sizes, labels
+
+    def put(
+        self, key: str, sizes: List[int], labels: Optional[np.ndarray] = None
+    ) -> None:
+        """Store a result, then evict old entries beyond :attr:`max_bytes`.
+
+        Args:
+            key: Key from :meth:`key`.
+            sizes: Component sizes in descending order.
+            labels: Optional per-point ``int32`` component labels.
+        """
+        arrays = {"sizes": np.asarray(sizes, dtype=np.int64)}
+        if labels is not None:
+            arrays["labels"] = np.asarray(labels, dtype=np.int32)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as output:
+            np.savez(output, **arrays)
+        os.replace(temporary, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries and digest memos until the cap
+        is respected."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIXES):
+                path = os.path.join(self.directory, name)
+                try:
+                    info = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((info.st_mtime_ns, info.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    def clear(self) -> None:
+        """Delete every entry and digest memo."""
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIXES):
+                self._discard(os.path.join(self.directory, name))
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """Replace *path* with *data* without exposing a partial file."""
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as output:
+            output.write(data)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        """Delete a file, ignoring one that is already gone."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,46 @@
+"""Tests of :mod:`batch_connectes`."""
+
+import multiprocessing
+import os
+import shutil
+
+import pytest
+
+import batch_connectes
+from batch_connectes import run_batch, solve_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = [os.path.join(ROOT, f"exemple_{i}.pts") for i in range(1, 5)]
+
+
+def _dying_solve_file(filename, *args):
+    """Kill the worker outright on a file named ``crash*``, like an OOM kill."""
+    if os.path.basename(filename).startswith("crash"):
+        os._exit(1)
+    return solve_file(filename, *args)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the patched task only reaches workers forked from this process",
+)
+@pytest.mark.parametrize("memory_budget", [None, 1])
+def test_killed_worker_fails_only_its_file(tmp_path, monkeypatch, memory_budget):
+    crash = tmp_path / "crash.pts"
+    shutil.copy(EXAMPLES[0], crash)
+    filenames = EXAMPLES[:2] + [str(crash)] + EXAMPLES[2:]
+    monkeypatch.setattr(batch_connectes, "solve_file", _dying_solve_file)
+
+    results = list(
+        run_batch(filenames, jobs=2, engine="grid", memory_budget=memory_budget)
+    )
+
+    assert [result.filename for result in results] == filenames
+    for result in results:
+        if result.filename == str(crash):
+            assert result.error is not None
+            assert result.sizes == []
+        else:
+            expected = solve_file(result.filename, engine="grid")
+            assert result.error is None
+            assert result.sizes == expected.sizes
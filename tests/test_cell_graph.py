@@ -0,0 +1,100 @@
+"""Tests of :mod:`cell_graph` against a brute-force pair scan."""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from cell_graph import compute_component_sizes_cell_graph
+from geo.point import Point
+from geo.point_array import PointArray
+from union_find import UnionFind
+
+
+def _brute_force(distance, coordinates):
+    """Sizes from every pair tested with :meth:`Point.distance_to`."""
+    points = [Point(row) for row in coordinates.tolist()]
+    forest = UnionFind(len(points))
+    for i, j in combinations(range(len(points)), 2):
+        if points[i].distance_to(points[j]) <= distance:
+            forest.union(i, j)
+    return forest.component_sizes()
+
+
+def _lattice_subset(seed, dimension, step, side):
+    """About half of a ``side ** dimension`` lattice of spacing *step*:
+    lattice neighbours are exactly *step* apart."""
+    rng = np.random.default_rng(seed)
+    grid = np.stack(
+        np.meshgrid(*[np.arange(side) * step] * dimension), axis=-1
+    ).reshape(-1, dimension)
+    return grid[rng.random(len(grid)) < 0.5]
+
+
+@pytest.mark.parametrize("dimension", [2, 3])
+@pytest.mark.parametrize("distance", [0.03, 0.08, 0.2])
+def test_random_points(dimension, distance):
+    coordinates = np.random.default_rng(dimension).random((300, dimension))
+
+    sizes = compute_component_sizes_cell_graph(
+        distance, PointArray(coordinates), verbose=False
+    )
+
+    assert sizes == _brute_force(distance, coordinates)
+
+
+@pytest.mark.parametrize("dimension, step", [(2, 0.25), (3, 0.5)])
+def test_lattice_neighbours_exactly_at_distance(dimension, step):
+    coordinates = _lattice_subset(4, dimension, step, 7 if dimension == 2 else 5)
+    below = np.nextafter(step, 0.0)
+
+    assert compute_component_sizes_cell_graph(
+        step, PointArray(coordinates), verbose=False
+    ) == _brute_force(step, coordinates)
+    # Just under the spacing, no lattice neighbours connect.
+    assert compute_component_sizes_cell_graph(
+        below, PointArray(coordinates), verbose=False
+    ) == [1] * len(coordinates)
+
+
+@pytest.mark.parametrize(
+    "offset, distance",
+    [((0.375, 0.5), 0.625), ((0.25, 0.5, 0.5), 0.75)],
+)
+def test_diagonal_pairs_exactly_at_distance(offset, distance):
+    # 3-4-5 and 1-2-2 triangles on a dyadic lattice: every coordinate and
+    # every pair distance is exact in binary.
+    rng = np.random.default_rng(9)
+    bases = rng.integers(0, 64, (40, len(offset))) * 0.125
+    coordinates = np.concatenate((bases, bases + np.asarray(offset)))
+    assert Point([0.0] * len(offset)).distance_to(Point(list(offset))) == distance
+
+    sizes = compute_component_sizes_cell_graph(
+        distance, PointArray(coordinates), verbose=False
+    )
+
+    assert sizes == _brute_force(distance, coordinates)
+    assert sizes.count(2) >= 1
+
+
+@pytest.mark.parametrize("distance", [0.0, -1.0, float("inf")])
+def test_degenerate_distances(distance):
+    rng = np.random.default_rng(2)
+    duplicates = rng.random((5, 3)).repeat(3, axis=0)
+    coordinates = np.concatenate((rng.random((30, 3)), duplicates))
+
+    sizes = compute_component_sizes_cell_graph(
+        distance, PointArray(coordinates), verbose=False
+    )
+
+    assert sizes == _brute_force(distance, coordinates)
+
+
+def test_point_list_input(capsys):
+    coordinates = np.random.default_rng(6).random((120, 2))
+    points = [Point(row) for row in coordinates.tolist()]
+
+    sizes = compute_component_sizes_cell_graph(0.1, points)
+
+    assert sizes == _brute_force(0.1, coordinates)
+    assert capsys.readouterr().out == "[" + ", ".join(map(str, sizes)) + "]\n"
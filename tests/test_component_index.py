@@ -0,0 +1,112 @@
+"""Tests of :mod:`component_index`."""
+
+import numpy as np
+import pytest
+
+from component_index import ComponentIndex
+from geo.point_array import PointArray
+from union_find import compute_component_sizes_union_find
+
+DISTANCE = 0.1
+
+
+def _recomputed(index):
+    """Sizes of the live points of *index*, computed from scratch."""
+    live = np.frombuffer(bytes(index.alive), dtype=bool)
+    points = PointArray(index.points.coordinates[live])
+    return compute_component_sizes_union_find(index.distance, points, verbose=False)
+
+
+def _count_rebuilds(monkeypatch, index):
+    """Record every call to ``index.rebuild`` (which still runs)."""
+    calls = []
+    rebuild = index.rebuild
+
+    def counted():
+        calls.append(True)
+        rebuild()
+
+    monkeypatch.setattr(index, "rebuild", counted)
+    return calls
+
+
+def _chain(start, count, y=0.0):
+    """``count`` points 0.08 apart along x: one component at DISTANCE."""
+    return [[start + 0.08 * i, y] for i in range(count)]
+
+
+def test_removing_a_bridge_splits_its_component(monkeypatch):
+    index = ComponentIndex(DISTANCE, rebuild_fraction=1.0)
+    # Two chains joined by one bridge point, and a larger separate cluster so
+    # that the flagged component stays under half of the points (repair path).
+    left = index.add_points(_chain(0.0, 5))
+    bridge = index.add_points([[0.40, 0.0]])
+    index.add_points(_chain(0.48, 5))
+    index.add_points(_chain(0.0, 20, y=5.0))
+    assert index.component_sizes() == [20, 11]
+    rebuilds = _count_rebuilds(monkeypatch, index)
+
+    index.remove_points(bridge)
+
+    assert index.component_sizes() == [20, 5, 5] == _recomputed(index)
+    assert rebuilds == []
+
+    # Later insertions still merge into the repaired pieces.
+    index.add_points([[0.40, 0.0]])
+    assert index.component_sizes() == [20, 11] == _recomputed(index)
+    index.remove_points([left[2]])
+    assert index.component_sizes() == [20, 8, 2] == _recomputed(index)
+    assert rebuilds == []
+
+
+def test_removals_past_rebuild_fraction_rebuild(monkeypatch):
+    index = ComponentIndex(DISTANCE, rebuild_fraction=0.1)
+    rows = index.add_points(_chain(0.0, 20) + _chain(0.0, 40, y=5.0))
+    rebuilds = _count_rebuilds(monkeypatch, index)
+
+    index.remove_points([rows[3]])
+    assert index.component_sizes() == [40, 16, 3] == _recomputed(index)
+    assert rebuilds == []
+
+    # 7 removals in total: more than 10 % of the 53 live points.
+    index.remove_points([rows[10], rows[25], rows[30], rows[35], rows[40], rows[45]])
+    assert index.component_sizes() == _recomputed(index)
+    assert rebuilds == [True]
+    assert index.component_count() == len(_recomputed(index))
+
+
+def test_removing_a_removed_point_is_ignored():
+    index = ComponentIndex(DISTANCE)
+    rows = index.add_points(_chain(0.0, 6) + _chain(0.0, 6, y=5.0))
+
+    index.remove_points([rows[2], rows[2]])
+    assert len(index) == 11
+    assert index.component_sizes() == [6, 3, 2] == _recomputed(index)
+
+    index.remove_points([rows[2]])
+    assert len(index) == 11
+    assert index.component_sizes() == [6, 3, 2] == _recomputed(index)
+
+
+@pytest.mark.parametrize("bad", [-1, 3, 100])
+def test_unknown_index_raises(bad):
+    index = ComponentIndex(DISTANCE)
+    index.add_points(_chain(0.0, 3))
+
+    with pytest.raises(IndexError):
+        index.remove_points([bad])
+    assert index.component_sizes() == [3] == _recomputed(index)
+
+
+@pytest.mark.parametrize("rebuild_fraction", [0.05, 1.0])
+def test_random_updates_match_recomputed_sizes(rebuild_fraction):
+    rng = np.random.default_rng(5)
+    index = ComponentIndex(DISTANCE, rebuild_fraction=rebuild_fraction)
+    live = []
+    for _ in range(15):
+        live.extend(index.add_points(rng.random((25, 2))))
+        gone = rng.choice(len(live), size=8, replace=False)
+        index.remove_points([live[i] for i in gone])
+        live = [row for i, row in enumerate(live) if i not in set(gone.tolist())]
+        assert len(index) == len(live)
+        assert index.component_sizes() == _recomputed(index)
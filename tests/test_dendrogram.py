@@ -0,0 +1,65 @@
+"""Tests of :class:`union_find.Dendrogram`."""
+
+import numpy as np
+import pytest
+
+from geo.point import Point
+from geo.point_array import PointArray
+from union_find import Dendrogram, compute_component_sizes_union_find
+
+
+def _independent(distance, points):
+    return compute_component_sizes_union_find(distance, points, verbose=False)
+
+
+@pytest.mark.parametrize("dimension", [2, 3])
+def test_many_thresholds_match_independent_runs(dimension):
+    coordinates = np.random.default_rng(dimension).random((400, dimension))
+    points = PointArray(coordinates)
+    # The shortest edge of point 0, exactly, and the float just below it:
+    # that edge joins point 0 to its component at the first threshold only.
+    first = Point(coordinates[0].tolist())
+    pair = min(first.distance_to(Point(row)) for row in coordinates[1:].tolist())
+    below = np.nextafter(pair, 0.0)
+    dendrogram = Dendrogram(points, 0.2)
+    thresholds = [0.2, 0.0, 0.05, pair, below, 0.1, 0.05]
+
+    answers = dendrogram.component_sizes_many(thresholds)
+
+    assert sorted(answers) == sorted(set(thresholds))
+    assert answers[pair] != answers[below]
+    for threshold in thresholds:
+        assert answers[threshold] == _independent(threshold, points)
+        assert dendrogram.component_sizes(threshold) == answers[threshold]
+
+
+def test_ties_exactly_at_threshold():
+    # Dyadic lattice: many edges are exactly 0.25 or sqrt(2) * 0.25 long.
+    rng = np.random.default_rng(3)
+    coordinates = np.stack(np.meshgrid(*[np.arange(8) * 0.25] * 2), -1).reshape(-1, 2)
+    coordinates = coordinates[rng.random(len(coordinates)) < 0.6]
+    points = PointArray(coordinates)
+    diagonal = Point([0.0, 0.0]).distance_to(Point([0.25, 0.25]))
+    thresholds = [np.nextafter(0.25, 0.0), 0.25, np.nextafter(diagonal, 0.0), diagonal]
+
+    answers = Dendrogram(points, diagonal).component_sizes_many(thresholds)
+
+    assert answers[np.nextafter(0.25, 0.0)] == [1] * len(coordinates)
+    for threshold in thresholds:
+        assert answers[threshold] == _independent(threshold, points)
+    assert answers[0.25] != answers[diagonal]
+
+
+def test_point_list_and_empty_input():
+    coordinates = np.random.default_rng(8).random((50, 2))
+    points = [Point(row) for row in coordinates.tolist()]
+
+    assert Dendrogram(points, 0.3).component_sizes(0.15) == _independent(0.15, points)
+    assert Dendrogram([], 0.3).component_sizes_many([0.1, 0.2]) == {0.1: [], 0.2: []}
+
+
+def test_threshold_above_maximum_raises():
+    dendrogram = Dendrogram(PointArray(np.random.default_rng(1).random((20, 2))), 0.1)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        dendrogram.component_sizes_many([0.05, 0.2])
@@ -0,0 +1,94 @@
+"""Tests of :mod:`out_of_core`."""
+
+import numpy as np
+import pytest
+
+import out_of_core
+from geo.point_array import PointArray
+from out_of_core import compute_component_sizes_out_of_core
+from pts_io import convert_pts_to_ptb
+from union_find import compute_component_sizes_union_find
+
+
+def _write_pts(path, distance, coordinates):
+    """Write a ``.pts`` file, full precision."""
+    with open(path, "w") as handle:
+        handle.write(f"{distance!r}\n")
+        for row in coordinates.tolist():
+            handle.write(", ".join(map(repr, row)) + "\n")
+    return str(path)
+
+
+def _clustered(seed, dimension):
+    """Gaussian clusters over uniform noise in the unit box."""
+    rng = np.random.default_rng(seed)
+    centres = rng.random((6, dimension))
+    clusters = centres.repeat(150, axis=0) + rng.normal(0.0, 0.04, (900, dimension))
+    return np.concatenate((clusters, rng.random((600, dimension))))
+
+
+@pytest.fixture
+def record_parts(monkeypatch):
+    """Record the tile grid chosen by each out-of-core run."""
+    layouts = []
+    choose_parts = out_of_core.choose_parts
+
+    def recorded(*args):
+        parts = choose_parts(*args)
+        layouts.append(parts)
+        return parts
+
+    monkeypatch.setattr(out_of_core, "choose_parts", recorded)
+    return layouts
+
+
+@pytest.mark.parametrize("dimension, distance", [(2, 0.02), (2, 0.04), (3, 0.06)])
+@pytest.mark.parametrize("binary", [False, True])
+def test_matches_in_memory_sizes(tmp_path, record_parts, dimension, distance, binary):
+    coordinates = _clustered(dimension, dimension)
+    filename = _write_pts(tmp_path / "points.pts", distance, coordinates)
+    if binary:
+        convert_pts_to_ptb(filename, str(tmp_path / "points.ptb"))
+        filename = str(tmp_path / "points.ptb")
+    expected = compute_component_sizes_union_find(
+        distance, PointArray(coordinates), verbose=False
+    )
+
+    sizes = compute_component_sizes_out_of_core(
+        filename, memory_budget=64 << 10, scratch_dir=str(tmp_path)
+    )
+
+    assert int(np.prod(record_parts[-1])) > 4
+    assert sizes == expected
+    # The tile files are gone with the scratch directory.
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        ["points.pts"] + (["points.ptb"] if binary else [])
+    )
+
+
+def test_one_tile_when_it_fits(tmp_path, record_parts):
+    coordinates = _clustered(1, 2)
+    filename = _write_pts(tmp_path / "points.pts", 0.03, coordinates)
+    expected = compute_component_sizes_union_find(
+        0.03, PointArray(coordinates), verbose=False
+    )
+
+    assert compute_component_sizes_out_of_core(filename) == expected
+    assert record_parts == [[1, 1]]
+
+
+def test_dense_cluster_over_budget_raises(tmp_path):
+    # Slabs stay at least 2 * distance wide: this box allows at most 2 x 2
+    # tiles of ~125 points, far over the 25 points a 4K budget holds.
+    coordinates = np.random.default_rng(0).random((500, 2)) * 0.2
+    filename = _write_pts(tmp_path / "dense.pts", 0.05, coordinates)
+
+    with pytest.raises(MemoryError, match="cannot be split further"):
+        compute_component_sizes_out_of_core(filename, memory_budget=4 << 10)
+
+
+def test_empty_file(tmp_path):
+    filename = tmp_path / "empty.pts"
+    filename.write_text("0.1\n")
+
+    assert compute_component_sizes_out_of_core(str(filename)) == []
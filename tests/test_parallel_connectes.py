@@ -0,0 +1,66 @@
+"""Tests of :mod:`parallel_connectes`."""
+
+import numpy as np
+import pytest
+
+from connectes import compute_component_labels, sizes_from_labels
+from geo.point_array import PointArray
+from parallel_connectes import compute_component_sizes_parallel, tile_layout
+
+
+def _uniform(seed):
+    """600 uniform points in the unit square."""
+    return np.random.default_rng(seed).random((600, 2))
+
+
+def _clustered(seed):
+    """Five tight Gaussian clusters plus uniform background noise."""
+    rng = np.random.default_rng(seed)
+    centres = rng.random((5, 2))
+    clusters = centres.repeat(100, axis=0) + rng.normal(0.0, 0.03, (500, 2))
+    return np.concatenate((clusters, rng.random((100, 2))))
+
+
+def _crossing(seed):
+    """Chains spanning the whole box, so that components cross every cut."""
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0.0, 1.0, 200)
+    chains = [
+        np.column_stack((t, np.full_like(t, 0.5))),
+        np.column_stack((np.full_like(t, 0.5), t)),
+        np.column_stack((t, t)),
+    ]
+    return np.concatenate(chains + [rng.random((200, 2))])
+
+
+def _expected(distance, coordinates):
+    points = PointArray(coordinates)
+    return sizes_from_labels(compute_component_labels(distance, points, "grid"))
+
+
+@pytest.mark.parametrize("make", [_uniform, _clustered, _crossing])
+@pytest.mark.parametrize("distance", [0.02, 0.05])
+def test_matches_sequential_labels(make, distance):
+    coordinates = make(7)
+    points = PointArray(coordinates)
+    assert np.prod(tile_layout(points.bounding_quadrant(), distance, 16)) > 1
+
+    sizes = compute_component_sizes_parallel(distance, points, workers=2, tiles=16)
+
+    assert sizes == _expected(distance, coordinates)
+
+
+def test_single_tile_fallback():
+    coordinates = _clustered(3)
+    points = PointArray(coordinates)
+    # Slabs may not get thinner than 2 * distance: no cut is possible here.
+    distance = 0.6
+    assert tile_layout(points.bounding_quadrant(), distance, 16) == [1, 1]
+
+    sizes = compute_component_sizes_parallel(distance, points, workers=2, tiles=16)
+
+    assert sizes == _expected(distance, coordinates)
+
+
+def test_empty_input():
+    assert compute_component_sizes_parallel(0.1, PointArray(np.empty((0, 2))), 2) == []
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Union-find (disjoint-set forest) implementation for connected-component sizes.
+
+Instead of traversing the graph, every edge — a pair of points within the
+distance threshold — is fed to a disjoint-set forest that merges the two
+endpoint sets.  Candidate pairs come from a uniform grid
+(:class:`~geo.grid.Grid`), so only points in the same or adjacent cells are
+ever compared.
+
+Unlike the traversals in :mod:`connectes` and :mod:`dfs_connectes`, the result
+does not depend on the order in which seeds or edges are processed: any edge
+can be merged at any time, and the final sets are always the components.
+
+:func:`close_pair_blocks` and :func:`component_labels_from_pairs` do the same
+with NumPy arrays only, for callers that must bound memory per point
+(:mod:`out_of_core`).
+
+:class:`Dendrogram` builds on this to answer many distance thresholds from a
+single edge enumeration (single-linkage clustering).
+"""
+
+import argparse
+from collections import Counter
+from itertools import chain, product
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from geo.grid import Grid
+from geo.point import Point, squared_radius
+from geo.point_array import PointArray
+
+
+class UnionFind:
+    """A disjoint-set forest over the integers ``0 .. n-1``.
+
+    Parents and set sizes live in two flat arrays.  :meth:`find` uses path
+    halving and :meth:`union` attaches the smaller tree under the larger one
+    (union by size), so any sequence of operations runs in near-constant
+    amortised time per call.
+
+    Examples:
+        Merge three elements into one set::
+
+            uf = UnionFind(4)
+            uf.union(0, 1)
+            uf.union(1, 2)
+            uf.component_sizes()  # [3, 1]
+    """
+
+    def __init__(self, n: int) -> None:
+        """Create *n* singleton sets.
+
+        Args:
+            n: Number of elements.
+        """
+        self.parent: List[int] = list(range(n))
+        self.size: List[int] = [1] * n
+
+    def add(self) -> int:
+        """Append a new singleton set.
+
+        Returns:
+            Index of the new element.
+        """
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x: int) -> int:
+        """Return the representative (root) of the set containing *x*.
+
+        Every visited node is re-linked to its grandparent on the way up
+        (path halving), which flattens the tree for later queries.
+
+        Args:
+            x: Element index.
+
+        Returns:
+            Index of the root of *x*'s set.
+        """
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing *a* and *b*.
+
+        Args:
+            a: First element index.
+            b: Second element index.
+
+        Returns:
+            ``True`` if two distinct sets were merged, ``False`` if *a* and *b*
+            were already in the same set.
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        size = self.size
+        if size[root_a] < size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        size[root_a] += size[root_b]
+        return True
+
+    def component_sizes(self) -> List[int]:
+        """Return the size of every set, sorted in descending order.
+
+        Returns:
+            One entry per root of the forest.
+        """
+        parent = self.parent
+        size = self.size
+        sizes = [size[i] for i in range(len(parent)) if parent[i] == i]
+        sizes.sort(reverse=True)
+        return sizes
+
+
+def close_pairs(
+    distance: float, points: Union[List[Point], PointArray]
+) -> Iterator[Tuple[int, int]]:
+    """Yield every unordered pair of points within *distance* exactly once.
+
+    Candidate pairs come from a :class:`~geo.grid.Grid` with cell side
+    *distance*.  With a :class:`~geo.point_array.PointArray`, each pair of
+    adjacent cells is tested as one vectorized block.
+
+    Args:
+        distance: Maximum Euclidean distance that defines an edge.
+        points: Complete point set.
+
+    Yields:
+        ``(i, j)`` index pairs with ``i != j``.
+    """
+    if len(points) == 0:
+        return
+    # Same safety margin as the grid engine in connectes.grid_candidates.
+    grid = Grid(points, distance * (1 + 1e-9))
+
+    r_squared = squared_radius(distance)
+
+    if not isinstance(points, PointArray):
+        for i, j in grid.candidate_pairs():
+            if points[i].within(points[j], r_squared):
+                yield i, j
+        return
+
+    for bucket_a, bucket_b in grid.neighbouring_buckets():
+        rows_a = np.asarray(bucket_a)
+        rows_b = np.asarray(bucket_b)
+        hits = points.block_squared_distances(rows_a, rows_b) <= r_squared
+        if bucket_a is bucket_b:
+            hits = np.triu(hits, k=1)
+        left, right = np.nonzero(hits)
+        yield from zip(rows_a[left].tolist(), rows_b[right].tolist())
+
+
+#: Candidate pairs tested at once by :func:`close_pair_blocks` by default.
+DEFAULT_PAIR_BLOCK = 1 << 16
+
+
+def void_rows(keys: np.ndarray) -> np.ndarray:
+    """View each row of an integer key matrix as one opaque, sortable item."""
+    keys = np.ascontiguousarray(keys)
+    return keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1])))[:, 0]
+
+
+def close_pair_blocks(
+    distance: float, points: PointArray, block_pairs: int = DEFAULT_PAIR_BLOCK
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield every unordered pair of points within *distance* exactly once, as
+    index arrays.
+
+    The pairs are those of :func:`close_pairs`, found without any per-point
+    Python object: the grid is a sorted array of cell keys, and the candidate
+    pairs of each cell with itself and with its forward neighbours are
+    enumerated and tested *block_pairs* at a time.  Beyond the coordinates,
+    memory stays at a few integers per point plus one block.
+
+    Args:
+        distance: Maximum Euclidean distance that defines an edge.
+        points: Complete point set.
+        block_pairs: Candidate pairs tested per block.
+
+    Yields:
+        ``(rows_a, rows_b)`` integer arrays of equal length, with
+        ``rows_a[k] != rows_b[k]``.
+    """
+    count = len(points)
+    if count == 0 or distance < 0:
+        return
+    dimension = points.dimension
+    # Same cell side and safety margin as close_pairs.
+    cell_size = distance * (1 + 1e-9) if distance > 0 else 1.0
+    keys = np.floor(points.coordinates / cell_size).astype(np.int64)
+    cells, inverse, counts = np.unique(
+        void_rows(keys), return_inverse=True, return_counts=True
+    )
+    del keys
+    members = np.argsort(inverse.reshape(-1), kind="stable")
+    del inverse
+    starts = np.cumsum(counts) - counts
+    cell_keys = cells.view(np.int64).reshape(-1, dimension)
+    r_squared = squared_radius(distance)
+    block_pairs = max(1, block_pairs)
+
+    origin = (0,) * dimension
+    for offset in product((-1, 0, 1), repeat=dimension):
+        if offset < origin:
+            continue
+        if offset == origin:
+            cell_a = np.flatnonzero(counts > 1)
+            cell_b = cell_a
+        else:
+            shifted = void_rows(cell_keys + np.asarray(offset, dtype=np.int64))
+            position = np.searchsorted(cells, shifted)
+            found = position < len(cells)
+            found[found] = cells[position[found]] == shifted[found]
+            cell_a = np.flatnonzero(found)
+            cell_b = position[found]
+            del shifted, position, found
+        if not len(cell_a):
+            continue
+
+        # Candidate k of cell pair p is (member k // width[p] of cell_a[p],
+        # member k % width[p] of cell_b[p]); the flat range is cut in blocks.
+        width = counts[cell_b]
+        sizes = counts[cell_a] * width
+        ends = np.cumsum(sizes)
+        total = int(ends[-1])
+        for low in range(0, total, block_pairs):
+            flat = np.arange(low, min(low + block_pairs, total), dtype=np.int64)
+            pair = np.searchsorted(ends, flat, side="right")
+            index_a, index_b = np.divmod(flat - (ends[pair] - sizes[pair]), width[pair])
+            del flat
+            if offset == origin:
+                keep = index_a < index_b
+                pair, index_a, index_b = pair[keep], index_a[keep], index_b[keep]
+            rows_a = members[starts[cell_a[pair]] + index_a]
+            rows_b = members[starts[cell_b[pair]] + index_b]
+            del pair, index_a, index_b
+            close = points.paired_squared_distances(rows_a, rows_b) <= r_squared
+            yield rows_a[close], rows_b[close]
+
+
+def _find_roots(parent: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Follow *parent* from every node of *nodes* up to its root."""
+    roots = parent[nodes]
+    while True:
+        above = parent[roots]
+        if np.array_equal(above, roots):
+            return roots
+        roots = above
+
+
+def component_labels_from_pairs(
+    count: int, pair_blocks: Iterable[Tuple[np.ndarray, np.ndarray]]
+) -> np.ndarray:
+    """Label ``0 .. count-1`` by connected component, merging blocks of pairs
+    in a vectorized forest.
+
+    Each block is merged in rounds: both ends of every pair are resolved to
+    their roots, and every root is hooked under the lowest root it is paired
+    with, until all the pairs of the block join a single tree.  The forest is
+    then flattened, so the lowest index of a set is its root.
+
+    Args:
+        count: Number of elements.
+        pair_blocks: ``(rows_a, rows_b)`` index arrays, e.g. from
+            :func:`close_pair_blocks`.
+
+    Returns:
+        ``intp`` array of labels ``0, 1, ...``, numbered in the order of each
+        component's lowest index.
+    """
+    parent = np.arange(count)
+    for left, right in pair_blocks:
+        if not len(left):
+            continue
+        while len(left):
+            left = _find_roots(parent, left)
+            right = _find_roots(parent, right)
+            apart = left != right
+            low = np.minimum(left[apart], right[apart])
+            high = np.maximum(left[apart], right[apart])
+            np.minimum.at(parent, high, low)
+            left, right = low, high
+        while True:
+            above = parent[parent]
+            if np.array_equal(above, parent):
+                break
+            parent = above
+    return np.unique(parent, return_inverse=True)[1].reshape(-1)
+
+
+def compute_component_sizes_union_find(
+    distance: float,
+    points: Union[List[Point], PointArray],
+    verbose: bool = True,
+) -> List[int]:
+    """Compute connected-component sizes with a disjoint-set forest.
+
+    Args:
+        distance: Maximum Euclidean distance that connects two points.
+        points: Complete list of points in the dataset, or their columnar
+            store.
+        verbose: When ``True``, print the sorted sizes to stdout in the form
+            ``[size1, size2, ...]``.
+
+    Returns:
+        Component sizes sorted in descending order.
+    """
+    forest = UnionFind(len(points))
+    union = forest.union
+    for i, j in close_pairs(distance, points):
+        union(i, j)
+
+    sizes = forest.component_sizes()
+
+    if verbose:
+        print("[" + ", ".join(map(str, sizes)) + "]")
+
+    return sizes
+
+
+class Dendrogram:
+    """Single-linkage dendrogram answering many distance thresholds at once.
+
+    All pairs closer than *max_distance* are enumerated once and sorted by
+    length.  The components for any threshold ``t <= max_distance`` are
+    exactly the sets formed by merging every edge of length ``<= t``, so a
+    query replays the sorted edges into a :class:`UnionFind` up to that cut.
+    Several thresholds are answered in one ascending replay, which costs about
+    as much as a single run.
+
+    Examples:
+        Sweep the threshold to pick a clustering scale::
+
+            dendrogram = Dendrogram(points, 0.2)
+            answers = dendrogram.component_sizes_many([0.05, 0.1, 0.2])
+            for t, sizes in answers.items():
+                print(t, sizes[:3])
+    """
+
+    def __init__(
+        self, points: Union[List[Point], PointArray], max_distance: float
+    ) -> None:
+        """Enumerate and sort every edge up to *max_distance*.
+
+        Edge lengths are computed exactly as
+        :meth:`~geo.point.Point.distance_to` would, so a threshold query is
+        bit-for-bit consistent with a direct run at that threshold.
+
+        Args:
+            points: Complete point set.
+            max_distance: Largest threshold that will ever be queried.
+        """
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        self.n = len(points)
+        self.max_distance = max_distance
+
+        flat = chain.from_iterable(close_pairs(max_distance, points))
+        pairs = np.fromiter(flat, dtype=np.intp).reshape(-1, 2)
+        coordinates = points.coordinates
+        diff = coordinates[pairs[:, 0], 0] - coordinates[pairs[:, 1], 0]
+        total = diff * diff
+        for axis in range(1, points.dimension):
+            diff = coordinates[pairs[:, 0], axis] - coordinates[pairs[:, 1], axis]
+            total += diff * diff
+
+        order = np.argsort(total, kind="stable")
+        self.lengths = np.sqrt(total[order])
+        self.left = pairs[order, 0].tolist()
+        self.right = pairs[order, 1].tolist()
+
+    def component_sizes(self, distance: float) -> List[int]:
+        """Return the component sizes for one threshold.
+
+        Args:
+            distance: Threshold, at most :attr:`max_distance`.
+
+        Returns:
+            Component sizes sorted in descending order.
+        """
+        return self.component_sizes_many([distance])[distance]
+
+    def component_sizes_many(
+        self, distances: Iterable[float]
+    ) -> Dict[float, List[int]]:
+        """Return the component sizes for several thresholds in one replay.
+
+        The multiset of component sizes is maintained incrementally while the
+        edges are merged in ascending length order, and snapshotted at each
+        requested cut.
+
+        Args:
+            distances: Thresholds, each at most :attr:`max_distance`.
+
+        Returns:
+            Mapping from each threshold to its descending size list.
+
+        Raises:
+            ValueError: If a threshold exceeds :attr:`max_distance`.
+        """
+        thresholds = sorted(set(distances))
+        if thresholds and thresholds[-1] > self.max_distance:
+            raise ValueError(
+                f"Threshold {thresholds[-1]} exceeds the precomputed maximum "
+                f"{self.max_distance}."
+            )
+
+        forest = UnionFind(self.n)
+        find, size = forest.find, forest.size
+        counts: Counter = Counter({1: self.n} if self.n else {})
+        left, right = self.left, self.right
+        merged = 0
+        results: Dict[float, List[int]] = {}
+
+        for threshold in thresholds:
+            cut = int(np.searchsorted(self.lengths, threshold, side="right"))
+            for edge in range(merged, cut):
+                root_a, root_b = find(left[edge]), find(right[edge])
+                if root_a == root_b:
+                    continue
+                size_a, size_b = size[root_a], size[root_b]
+                forest.union(root_a, root_b)
+                counts[size_a] -= 1
+                counts[size_b] -= 1
+                counts[size_a + size_b] += 1
+            merged = max(merged, cut)
+
+            sizes: List[int] = []
+            for value, count in sorted(counts.items(), reverse=True):
+                sizes.extend([value] * count)
+            results[threshold] = sizes
+
+        return results
+
+
+def main() -> None:
+    """Entry point: process one or more ``.pts`` files passed on the command line."""
+    from connectes import load_instance  # deferred: keeps connectes free to import us
+
+    parser = argparse.ArgumentParser(
+        description="Print connected-component sizes using union-find."
+    )
+    parser.add_argument("instances", nargs="*", help=".pts files to process")
+    parser.add_argument(
+        "--array",
+        action="store_true",
+        help="load points into a columnar NumPy store (vectorized distances)",
+    )
+    args = parser.parse_args()
+
+    if not args.instances:
+        parser.print_usage()
+        return
+
+    for filename in args.instances:
+        try:
+            distance, points = load_instance(filename, as_array=args.array)
+            print(f"# {filename} ({len(points)} points)")
+            compute_component_sizes_union_find(distance, points)
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+
+
+if __name__ == "__main__":
+    main()